@@ -1,19 +1,27 @@
 import streamlit as st
-import pypdf
 from groq import Groq
 import os
 import pandas as pd
+import numpy as np
 from dotenv import load_dotenv
-import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
 import tempfile
 import requests
-import re
-import random
+import json
+import queue
+import time
+from concurrent.futures import as_completed
 from serpapi import GoogleSearch
+from llm_cache import get_llm_cache
+from llm_limits import call_with_retry, estimate_tokens, get_groq_limiter, get_llm_executor
+from pdf_extract import extract_pdf_text
+from scrape import JobScraper, CSV_FIELDNAMES, SCRAPE_SAVE_CSV, csv_output_path, get_output_writer
+from job_store import get_job_store, link_key
+from mailer import get_mailer
+from dispatch import APPLICANT_NAME, ResumeAttachment, build_application, is_valid_email
+from application_ledger import get_application_ledger
+from tasks import FINISHED_STATUSES, TASK_POLL_INTERVAL, get_task_queue, submit_task
 
 # Load environment variables
 load_dotenv()
@@ -27,17 +35,23 @@ EMAIL_ADDRESS = os.getenv('EMAIL_ADDRESS')
 EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD')
 RECIPIENT_EMAIL = os.getenv('RECIPIENT_EMAIL')  # Add this to your .env file
 
+# Rows sent to Groq per missing-field enrichment request (1 = one call per row)
+ENRICH_CHUNK_SIZE = int(os.getenv('ENRICH_CHUNK_SIZE', 20))
+
+# Bump a version whenever its prompt changes so cached answers are not reused
+PROMPT_VERSIONS = {
+    'resume_keyword': 1,
+    'analyze_resume': 1,
+    'ats_score': 1
+}
+
+# Jobs re-ranked by the LLM after the local TF-IDF pre-filter; the rest keep their local score
+LLM_RERANK_TOP_K = int(os.getenv('LLM_RERANK_TOP_K', 10))
+
 client = Groq(api_key=GROQ_API_KEY)
 
 # Custom CSS for dark theme professional UI
-st.set_page_config(
-    page_title="AI Resume Analyzer",
-    page_icon="📄",
-    layout="wide", 
-    initial_sidebar_state="collapsed"
-)
-
-st.markdown("""
+PAGE_CSS = """
 <style>
 /* Dark theme configuration */
 .stApp {
@@ -290,28 +304,40 @@ h2, h3 {
     margin: 1rem 0;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def setup_page():
+    """Page config and theme; called from app() so importing this module (e.g. in task workers) has no UI side effects"""
+    st.set_page_config(
+        page_title="AI Resume Analyzer",
+        page_icon="📄",
+        layout="wide", 
+        initial_sidebar_state="collapsed"
+    )
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
 def extract_text_from_pdf(pdf_file):
     """Extract text from uploaded PDF file(s)"""
     try:
-        texts = []
-        pdf_reader = pypdf.PdfReader(pdf_file)
-        for page in pdf_reader.pages:
-            texts.append(page.extract_text())
-        return " ".join(texts)
+        # Cached by file hash, so reruns over the same upload skip parsing
+        return extract_pdf_text(pdf_file)
     except Exception as e:
         st.error(f"Error extracting text from PDF: {str(e)}")
         return None
 
+def clean_keyword(keyword):
+    """Clean up the keyword (remove any commas or extra text)"""
+    return keyword.strip().split(',')[0].strip()
+
 def extract_resume_keywords(extracted_text):
-    """Extract a single most relevant keyword or job title from resume for job search"""
-    try:
-        response = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are a job search expert. Extract the SINGLE most relevant job title or keyword from the resume. Just return the job title or keyword.
+    """Extract a single most relevant keyword or job title from resume for job search
+    
+    Runs on worker threads, so errors are raised for the caller to report.
+    """
+    messages = [
+        {
+            "role": "system",
+            "content": """You are a job search expert. Extract the SINGLE most relevant job title or keyword from the resume. Just return the job title or keyword.
 
                     Focus on:
                     1. The most suitable job title the person is qualified for
@@ -320,289 +346,320 @@ def extract_resume_keywords(extracted_text):
                     Return ONLY ONE specific and searchable term (e.g., "Software Engineer", "Data Analyst", "Python Developer").
                     This should be the most relevant job title or skill that will yield the best job search results.
                     Don't include generic terms like "motivated" or "hardworking"."""
-                },
-                {
-                    "role": "user", 
-                    "content": f"""Extract the single most relevant job title or keyword from this resume:
+        },
+        {
+            "role": "user", 
+            "content": f"""Extract the single most relevant job title or keyword from this resume:
                     {extracted_text}"""
-                }
-            ],
-            model="llama3-70b-8192",
-            temperature=0.3
-        )
+        }
+    ]
+    
+    def request():
+        def create():
+            return client.chat.completions.create(
+                messages=messages,
+                model="llama3-70b-8192",
+                temperature=0.3
+            )
         
-        keyword = response.choices[0].message.content.strip()
-        # Clean up the keyword (remove any commas or extra text)
-        keyword = keyword.split(',')[0].strip()
-        return keyword
-    except Exception as e:
-        st.error(f"Error extracting keyword: {str(e)}")
-        return ""
+        # Shared RPM/TPM limiter with jittered retries on 429
+        response = call_with_retry(create, get_groq_limiter(),
+                                   estimate_tokens(*[message["content"] for message in messages], completion_tokens=20))
+        return response.choices[0].message.content
+    
+    # Reruns on an unchanged resume are served from the persistent cache
+    content = get_llm_cache().get_or_compute('resume_keyword', extracted_text, "llama3-70b-8192",
+                                             PROMPT_VERSIONS['resume_keyword'], 0.3, request)
+    return clean_keyword(content)
 
-def clean_csv_data(csv_path, keyword):
-    """Clean CSV data using Groq API to fill in missing values and filter invalid entries"""
+ENRICH_FIELD_COLUMNS = {
+    'Role': 'Role',
+    'Location': 'Location',
+    'Stipend': 'Stipend (₹/month)'
+}
+
+def enrich_row_missing_fields(cleaned_df, row, keyword):
+    """Fill the missing fields of a single row with one Groq call"""
+    company = row['company']
+    missing_fields = row['missing']
     try:
-        # Read the CSV file
-        if not os.path.exists(csv_path):
-            st.error(f"CSV file not found: {csv_path}")
-            return None
-            
-        df = pd.read_csv(csv_path)
-        if df.empty:
-            st.warning("CSV file is empty")
-            return df
-            
-        # Make a copy to avoid modifying the original during iteration
-        cleaned_df = df.copy()
-        rows_to_drop = []
-        
-        # Process each row
-        for index, row in df.iterrows():
-            # Skip entries with NA company name or apply link
-            company = str(row.get('Company', '')).strip()
-            apply_link = str(row.get('Apply Link', '')).strip()
-            
-            # Skip entries with asterisks (censored/invalid data)
-            if '*' in company or '*' in apply_link:
-                rows_to_drop.append(index)
-                continue
-                
-            if company.lower() in ['na', 'n/a', '', 'nan', 'none'] or apply_link.lower() in ['na', 'n/a', '', 'nan', 'none', '#']:
-                rows_to_drop.append(index)
-                continue
-                
-            # Check for missing values in Role, Location, or Stipend
-            role = str(row.get('Role', '')).strip()
-            location = str(row.get('Location', '')).strip()
-            stipend = str(row.get('Stipend (₹/month)', '')).strip()
-            
-            # Skip entries with asterisks in important fields
-            if '*' in role or '*' in location or '*' in stipend:
-                rows_to_drop.append(index)
-                continue
-                
-            missing_fields = []
-            if role.lower() in ['na', 'n/a', '', 'nan', 'none']:
-                missing_fields.append('Role')
-            if location.lower() in ['na', 'n/a', '', 'nan', 'none']:
-                missing_fields.append('Location')
-            if stipend.lower() in ['na', 'n/a', '', 'nan', 'none']:
-                missing_fields.append('Stipend')
-                
-            # If there are missing fields, use Groq API to fill them
-            if missing_fields:
-                try:
-                    response = client.chat.completions.create(
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": """You are a job data enhancement expert. Fill in missing job information based on the company name and other available details.
-                                Provide realistic values for missing fields. Format your response exactly as requested."""
-                            },
-                            {
-                                "role": "user", 
-                                "content": f"""For a job at {company}, I need to fill in the following missing fields: {', '.join(missing_fields)}.
-                                
-                                Available information:
-                                - Company: {company}
-                                - Role: {role if 'Role' not in missing_fields else 'MISSING'}
-                                - Location: {location if 'Location' not in missing_fields else 'MISSING'}
-                                - Stipend: {stipend if 'Stipend' not in missing_fields else 'MISSING'}
-                                - Job Search Keyword: {keyword}
-                                
-                                For each missing field, provide a realistic value based on the company and available information.
-                                Format your response exactly like this example:
-                                Role: Software Engineer
-                                Location: Bangalore, Karnataka
-                                Stipend: ₹25,000 - ₹30,000
-                                
-                                Only include the missing fields in your response."""
-                            }
-                        ],
-                        model="llama3-70b-8192",
-                        temperature=0.7
-                    )
+        messages = [
+            {
+                "role": "system",
+                "content": """You are a job data enhancement expert. Fill in missing job information based on the company name and other available details.
+                    Provide realistic values for missing fields. Format your response exactly as requested."""
+            },
+            {
+                "role": "user", 
+                "content": f"""For a job at {company}, I need to fill in the following missing fields: {', '.join(missing_fields)}.
                     
-                    ai_response = response.choices[0].message.content.strip()
+                    Available information:
+                    - Company: {company}
+                    - Role: {row['role'] if 'Role' not in missing_fields else 'MISSING'}
+                    - Location: {row['location'] if 'Location' not in missing_fields else 'MISSING'}
+                    - Stipend: {row['stipend'] if 'Stipend' not in missing_fields else 'MISSING'}
+                    - Job Search Keyword: {keyword}
                     
-                    # Parse the response and update the missing fields
-                    for line in ai_response.split('\n'):
-                        if ':' in line:
-                            field, value = line.split(':', 1)
-                            field = field.strip()
-                            value = value.strip()
-                            
-                            if field == 'Role' and 'Role' in missing_fields:
-                                cleaned_df.at[index, 'Role'] = value
-                            elif field == 'Location' and 'Location' in missing_fields:
-                                cleaned_df.at[index, 'Location'] = value
-                            elif field == 'Stipend' and 'Stipend' in missing_fields:
-                                cleaned_df.at[index, 'Stipend (₹/month)'] = value
-                except Exception as e:
-                    st.warning(f"Error filling missing data for {company}: {str(e)}")
-            
-            # Generate random email ID if missing
-            email = str(row.get('EmailID', '')).strip()
-            if email.lower() in ['na', 'n/a', '', 'nan', 'none'] or '*' in email:
-                # Clean company name for email
-                company_clean = re.sub(r'[^a-zA-Z0-9]', '', company.lower())
-                if company_clean:
-                    domains = ['gmail.com', 'outlook.com', 'yahoo.com', 'company.com', 'mail.com']
-                    email_patterns = [
-                        f"careers@{company_clean}.com",
-                        f"jobs@{company_clean}.com",
-                        f"hr@{company_clean}.com",
-                        f"info@{company_clean}.com",
-                        f"contact@{company_clean}.com"
-                    ]
-                    cleaned_df.at[index, 'EmailID'] = random.choice(email_patterns)
+                    For each missing field, provide a realistic value based on the company and available information.
+                    Format your response exactly like this example:
+                    Role: Software Engineer
+                    Location: Bangalore, Karnataka
+                    Stipend: ₹25,000 - ₹30,000
+                    
+                    Only include the missing fields in your response."""
+            }
+        ]
         
-        # Drop rows with invalid data
-        cleaned_df = cleaned_df.drop(rows_to_drop)
+        def create():
+            return client.chat.completions.create(
+                messages=messages,
+                model="llama3-70b-8192",
+                temperature=0.7
+            )
         
-        # Reset index after dropping rows
-        cleaned_df = cleaned_df.reset_index(drop=True)
+        # Shared RPM/TPM limiter with jittered retries on 429
+        response = call_with_retry(create, get_groq_limiter(),
+                                   estimate_tokens(*[message["content"] for message in messages], completion_tokens=60))
         
-        st.info(f"Filtered out {len(rows_to_drop)} invalid entries (including those with asterisks)")
-        return cleaned_df
+        ai_response = response.choices[0].message.content.strip()
         
+        # Parse the response and update the missing fields
+        for line in ai_response.split('\n'):
+            if ':' in line:
+                field, value = line.split(':', 1)
+                field = field.strip()
+                value = value.strip()
+                
+                if field in missing_fields and field in ENRICH_FIELD_COLUMNS:
+                    cleaned_df.at[row['id'], ENRICH_FIELD_COLUMNS[field]] = value
+    except Exception as e:
+        st.warning(f"Error filling missing data for {company}: {str(e)}")
+
+def enrich_rows_batch(rows, keyword):
+    """Fill missing fields for many rows with one structured Groq call
+    
+    Returns a dict mapping row id to {field: value}. Raises if the response
+    is not the JSON shape we asked for.
+    """
+    payload = [
+        {
+            "id": int(row['id']),
+            "company": row['company'],
+            "role": None if 'Role' in row['missing'] else row['role'],
+            "location": None if 'Location' in row['missing'] else row['location'],
+            "stipend": None if 'Stipend' in row['missing'] else row['stipend'],
+            "missing": row['missing']
+        }
+        for row in rows
+    ]
+    
+    messages = [
+        {
+            "role": "system",
+            "content": """You are a job data enhancement expert. Fill in missing job information based on the company name and other available details.
+                Provide realistic values for missing fields. Respond with JSON only."""
+        },
+        {
+            "role": "user",
+            "content": f"""Job Search Keyword: {keyword}
+                
+                Each job below lists the fields that are missing. For every job, provide a realistic value for each missing field based on the company and available information.
+                
+                Jobs:
+                {json.dumps(payload, ensure_ascii=False)}
+                
+                Respond with a JSON object exactly in this shape, with one entry per job id and only the missing fields:
+                {{"rows": [{{"id": 0, "Role": "Software Engineer", "Location": "Bangalore, Karnataka", "Stipend": "₹25,000 - ₹30,000"}}]}}"""
+        }
+    ]
+    
+    def create():
+        return client.chat.completions.create(
+            messages=messages,
+            model="llama3-70b-8192",
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
+    
+    # Shared RPM/TPM limiter with jittered retries on 429
+    response = call_with_retry(create, get_groq_limiter(),
+                               estimate_tokens(*[message["content"] for message in messages], completion_tokens=40 * len(rows)))
+    
+    data = json.loads(response.choices[0].message.content)
+    return {int(item['id']): item for item in data['rows']}
+
+def enrich_missing_fields(cleaned_df, rows, keyword, chunk_size=ENRICH_CHUNK_SIZE):
+    """Fill missing Role/Location/Stipend values in chunks of rows per Groq call
+    
+    Rows the batch answer doesn't cover (or whole chunks whose answer can't
+    be parsed) fall back to one call per row.
+    """
+    if chunk_size <= 1:
+        for row in rows:
+            enrich_row_missing_fields(cleaned_df, row, keyword)
+        return
+    
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            answers = enrich_rows_batch(chunk, keyword)
+        except Exception as e:
+            st.warning(f"Batch enrichment failed, falling back to per-row calls: {str(e)}")
+            answers = {}
+        
+        for row in chunk:
+            answer = answers.get(int(row['id']), {})
+            values = {field: str(answer.get(field, '')).strip() for field in row['missing']}
+            if all(values.values()):
+                for field, value in values.items():
+                    cleaned_df.at[row['id'], ENRICH_FIELD_COLUMNS[field]] = value
+            else:
+                enrich_row_missing_fields(cleaned_df, row, keyword)
+
+# Placeholder values treated as missing when validating scraped rows
+INVALID_VALUES = ['na', 'n/a', '', 'nan', 'none']
+
+# Prefixes for generated contact emails
+EMAIL_PREFIXES = np.array(['careers', 'jobs', 'hr', 'info', 'contact'])
+
+def text_column(df, column):
+    """Stripped text of a column, with absent columns and NaN as empty strings"""
+    if column not in df.columns:
+        return pd.Series('', index=df.index)
+    return df[column].fillna('').astype(str).str.strip()
+
+def backfill_emails(df, company, mask):
+    """Write a random careers@/jobs@/... address for the company into EmailID where mask is set"""
+    # Clean company name for email
+    company_clean = company[mask].str.lower().str.replace(r'[^a-zA-Z0-9]', '', regex=True)
+    company_clean = company_clean[company_clean != '']
+    if company_clean.empty:
+        return
+    prefixes = EMAIL_PREFIXES[np.random.randint(len(EMAIL_PREFIXES), size=len(company_clean))]
+    df.loc[company_clean.index, 'EmailID'] = prefixes + '@' + company_clean + '.com'
+
+def clean_csv_data(csv_path, keyword, chunk_size=ENRICH_CHUNK_SIZE):
+    """Clean CSV data using Groq API to fill in missing values and filter invalid entries"""
+    # Read the CSV file
+    if not os.path.exists(csv_path):
+        st.error(f"CSV file not found: {csv_path}")
+        return None
+    
+    try:
+        df = pd.read_csv(csv_path, dtype=str)  # Text columns so enriched values can be written back
     except Exception as e:
         st.error(f"Error cleaning CSV data: {str(e)}")
         return None
+    return clean_jobs_data(df, keyword, chunk_size)
 
-def run_scraper_with_keyword(keyword):
-    """Run the scraper with the extracted keyword and clean the resulting CSV"""
+def jobs_to_dataframe(jobs_data):
+    """Scraped job records as a text-column DataFrame ready for clean_jobs_data"""
+    return pd.DataFrame.from_records(jobs_data, columns=CSV_FIELDNAMES + ['Source']).astype(str)
+
+def clean_jobs_data(df, keyword, chunk_size=ENRICH_CHUNK_SIZE, raise_errors=False):
+    """Clean scraped job data using Groq API to fill in missing values and filter invalid entries
+    
+    df must have text columns; enriched values and generated emails are written into it in place.
+    Errors are shown on the page and None is returned, unless raise_errors
+    is set for headless callers, where Streamlit messages go nowhere.
+    """
     try:
-        # Import the scraper module
-        import sys
-        import os
-        sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-        from scrape import JobScraper
+        if df.empty:
+            st.warning("No job data to clean")
+            return df
+            
+        # Validate whole columns at once; rows are only touched for enrichment
+        company = text_column(df, 'Company')
+        apply_link = text_column(df, 'Apply Link')
+        role = text_column(df, 'Role')
+        location = text_column(df, 'Location')
+        stipend = text_column(df, 'Stipend (₹/month)')
+        email = text_column(df, 'EmailID')
         
-        # Create a scraper instance
-        scraper = JobScraper(use_selenium=True)
+        # Drop entries with asterisks (censored/invalid data) or NA company name / apply link
+        has_asterisk = (company.str.contains('*', regex=False) | apply_link.str.contains('*', regex=False) |
+                        role.str.contains('*', regex=False) | location.str.contains('*', regex=False) |
+                        stipend.str.contains('*', regex=False))
+        drop_mask = (has_asterisk | company.str.lower().isin(INVALID_VALUES) |
+                     apply_link.str.lower().isin(INVALID_VALUES + ['#']))
+        keep_mask = ~drop_mask
         
-        # Run the scraper with the keyword
-        st.info(f"🔍 Scraping jobs for keyword: {keyword}")
-        with st.spinner(f"Scraping job listings for '{keyword}'..."):
-            jobs_data = scraper.run_scraper(keyword, use_all_sources=True)
+        # Flag missing values in Role, Location, or Stipend
+        missing = pd.DataFrame({
+            'Role': role.str.lower().isin(INVALID_VALUES),
+            'Location': location.str.lower().isin(INVALID_VALUES),
+            'Stipend': stipend.str.lower().isin(INVALID_VALUES)
+        }) & keep_mask.to_numpy()[:, None]
+        needs_enrich = missing.any(axis=1)
         
-        # Get the CSV file path (the scraper saves it automatically)
-        csv_files = [f for f in os.listdir() if f.startswith('jobs_internships_') and f.endswith('.csv')]
-        if not csv_files:
-            st.error("❌ No CSV file was generated by the scraper")
-            return None
+        # Only rows with missing fields become dicts, they are filled in batches below
+        rows_to_enrich = [
+            {
+                'id': index,
+                'company': row_company,
+                'role': row_role,
+                'location': row_location,
+                'stipend': row_stipend,
+                'missing': [field for field, flag in zip(missing.columns, flags) if flag]
+            }
+            for index, row_company, row_role, row_location, row_stipend, flags in zip(
+                df.index[needs_enrich], company[needs_enrich], role[needs_enrich],
+                location[needs_enrich], stipend[needs_enrich], missing[needs_enrich].to_numpy()
+            )
+        ]
         
-        # Sort by creation time (newest first)
-        csv_files.sort(key=lambda x: os.path.getctime(x), reverse=True)
-        csv_path = csv_files[0]
+        # Generate random email ID if missing
+        email_missing = keep_mask & (email.str.lower().isin(INVALID_VALUES) | email.str.contains('*', regex=False))
+        cleaned_df = df
+        backfill_emails(cleaned_df, company, email_missing)
         
-        # Clean the CSV data
-        with st.spinner("Cleaning and enhancing job data..."):
-            cleaned_df = clean_csv_data(csv_path, keyword)
-        
-        if cleaned_df is not None:
-            # Save the cleaned data back to CSV
-            cleaned_csv_path = f"cleaned_{csv_path}"
-            cleaned_df.to_csv(cleaned_csv_path, index=False)
-            st.success(f"✅ Scraped and cleaned {len(cleaned_df)} job listings")
-            return cleaned_df
-        else:
-            st.error("❌ Failed to clean CSV data")
-            return None
-            
-    except Exception as e:
-        st.error(f"Error running scraper: {str(e)}")
-        return None
-            
-        missing_fields = []
-        if role.lower() in ['na', 'n/a', '', 'nan', 'none']:
-            missing_fields.append('Role')
-        if location.lower() in ['na', 'n/a', '', 'nan', 'none']:
-            missing_fields.append('Location')
-        if stipend.lower() in ['na', 'n/a', '', 'nan', 'none']:
-            missing_fields.append('Stipend')
-                
-            # If there are missing fields, use Groq API to fill them
-            if missing_fields:
-                try:
-                    response = client.chat.completions.create(
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": """You are a job data enhancement expert. Fill in missing job information based on the company name and other available details.
-                                Provide realistic values for missing fields. Format your response exactly as requested."""
-                            },
-                            {
-                                "role": "user", 
-                                "content": f"""For a job at {company}, I need to fill in the following missing fields: {', '.join(missing_fields)}.
-                                
-                                Available information:
-                                - Company: {company}
-                                - Role: {role if 'Role' not in missing_fields else 'MISSING'}
-                                - Location: {location if 'Location' not in missing_fields else 'MISSING'}
-                                - Stipend: {stipend if 'Stipend' not in missing_fields else 'MISSING'}
-                                - Job Search Keyword: {keyword}
-                                
-                                For each missing field, provide a realistic value based on the company and available information.
-                                Format your response exactly like this example:
-                                Role: Software Engineer
-                                Location: Bangalore, Karnataka
-                                Stipend: ₹25,000 - ₹30,000
-                                
-                                Only include the missing fields in your response."""
-                            }
-                        ],
-                        model="llama3-70b-8192",
-                        temperature=0.7
-                    )
-                    
-                    ai_response = response.choices[0].message.content.strip()
-                    
-                    # Parse the response and update the missing fields
-                    for line in ai_response.split('\n'):
-                        if ':' in line:
-                            field, value = line.split(':', 1)
-                            field = field.strip()
-                            value = value.strip()
-                            
-                            if field == 'Role' and 'Role' in missing_fields:
-                                cleaned_df.at[index, 'Role'] = value
-                            elif field == 'Location' and 'Location' in missing_fields:
-                                cleaned_df.at[index, 'Location'] = value
-                            elif field == 'Stipend' and 'Stipend' in missing_fields:
-                                cleaned_df.at[index, 'Stipend (₹/month)'] = value
-                except Exception as e:
-                    st.warning(f"Error filling missing data for {company}: {str(e)}")
-            
-            # Generate random email ID if missing
-            email = str(row.get('EmailID', '')).strip()
-            if email.lower() in ['na', 'n/a', '', 'nan', 'none']:
-                # Clean company name for email
-                company_clean = re.sub(r'[^a-zA-Z0-9]', '', company.lower())
-                if company_clean:
-                    domains = ['gmail.com', 'outlook.com', 'yahoo.com', 'company.com', 'mail.com']
-                    email_patterns = [
-                        f"careers@{company_clean}.com",
-                        f"jobs@{company_clean}.com",
-                        f"hr@{company_clean}.com",
-                        f"info@{company_clean}.com",
-                        f"contact@{company_clean}.com"
-                    ]
-                    cleaned_df.at[index, 'EmailID'] = random.choice(email_patterns)
+        # Use Groq API to fill the missing fields
+        if rows_to_enrich:
+            enrich_missing_fields(cleaned_df, rows_to_enrich, keyword, chunk_size)
         
         # Drop rows with invalid data
-        cleaned_df = cleaned_df.drop(rows_to_drop)
+        cleaned_df = cleaned_df[keep_mask]
         
         # Reset index after dropping rows
         cleaned_df = cleaned_df.reset_index(drop=True)
         
+        st.info(f"Filtered out {int(drop_mask.sum())} invalid entries (including those with asterisks)")
         return cleaned_df
         
     except Exception as e:
+        if raise_errors:
+            raise
         st.error(f"Error cleaning CSV data: {str(e)}")
         return None
 
+def scrape_jobs(keyword, use_cache=True, progress=print):
+    """Run the scraper with the keyword and clean the scraped records; returns the cleaned DataFrame
+    
+    Runs in a background task worker, so it reports through `progress`
+    instead of Streamlit. Returns None when nothing was found.
+    use_cache=False bypasses the on-disk response cache and re-downloads every listing page.
+    """
+    # Create a scraper instance
+    scraper = JobScraper(use_selenium=True, use_cache=use_cache)
+    
+    # Run the scraper with the keyword; only the cleaned jobs are stored below
+    progress(f"Scraping job listings for '{keyword}'...")
+    jobs_data = scraper.run_scraper(keyword, use_all_sources=True, store=False, save_async=True)
+    if not jobs_data:
+        return None
+    
+    # Clean the scraped records in memory
+    progress(f"Cleaning and enhancing {len(jobs_data)} job listings...")
+    cleaned_df = clean_jobs_data(jobs_to_dataframe(jobs_data), keyword, raise_errors=True)
+    
+    # Persist the cleaned data; the task result is returned without waiting for the writes
+    writer = get_output_writer()
+    writer.submit(get_job_store().upsert, cleaned_df.to_dict('records'), keyword)
+    scraper.save_sightings(background=True)  # Queued after the upsert on the same writer thread
+    if SCRAPE_SAVE_CSV:
+        writer.submit(cleaned_df.to_csv, csv_output_path("cleaned_jobs_internships"), index=False)
+    return cleaned_df
+
 def search_jobs_with_serpapi(query, location="India", job_type="internship", num_results=20):
     """Search for jobs using SerpAPI Google Jobs API"""
     try:
@@ -648,10 +705,17 @@ def search_jobs_with_serpapi(query, location="India", job_type="internship", num
         st.error(f"Error searching jobs: {str(e)}")
         return []
 
-def calculate_job_match_score(job, resume_text):
-    """Calculate how well a job matches the resume"""
-    try:
-        response = client.chat.completions.create(
+def request_job_match_score(job, resume_text):
+    """Ask Groq for a 1-10 match score; raises on API errors"""
+    job_prompt = f"""Rate this job match (1-10):
+                    
+                    JOB: {job.get('title', '')} at {job.get('company', '')}
+                    DESCRIPTION: {job.get('description', '')[:500]}...
+                    
+                    RESUME: {resume_text[:1000]}..."""
+    
+    def create():
+        return client.chat.completions.create(
             messages=[
                 {
                     "role": "system",
@@ -667,19 +731,21 @@ def calculate_job_match_score(job, resume_text):
                 },
                 {
                     "role": "user", 
-                    "content": f"""Rate this job match (1-10):
-                    
-                    JOB: {job.get('title', '')} at {job.get('company', '')}
-                    DESCRIPTION: {job.get('description', '')[:500]}...
-                    
-                    RESUME: {resume_text[:1000]}..."""
+                    "content": job_prompt
                 }
             ],
             model="llama3-70b-8192",
             temperature=0.1
         )
-        
-        score_text = response.choices[0].message.content.strip()
+    
+    # Shared RPM/TPM limiter with jittered retries on 429
+    response = call_with_retry(create, get_groq_limiter(), estimate_tokens(job_prompt, completion_tokens=120))
+    return response.choices[0].message.content.strip()
+
+def calculate_job_match_score(job, resume_text):
+    """Calculate how well a job matches the resume"""
+    try:
+        score_text = request_job_match_score(job, resume_text)
         try:
             score = int(float(score_text.split()[0]))
             return max(1, min(10, score))  # Ensure score is between 1-10
@@ -688,20 +754,24 @@ def calculate_job_match_score(job, resume_text):
     except Exception as e:
         return 5  # Default score on error
 
-def send_application_email(jobs_list, resume_file, resume_filename):
-    """Send application email with resume attachment and CSV file"""
-    try:
-        # Check if email password is configured
-        if not EMAIL_PASSWORD:
-            return False, "Email password not configured. Please add EMAIL_PASSWORD to your .env file."
-        
-        msg = MIMEMultipart()
-        msg['From'] = EMAIL_ADDRESS
-        msg['To'] = RECIPIENT_EMAIL
-        msg['Subject'] = f"Job Applications Submitted - {len(jobs_list)} Positions"
-        
-        # Create email body
-        body = f"""Dear Team,
+def score_jobs_concurrently(jobs, resume_text):
+    """Score jobs on the shared Groq worker pool, yielding each job as its score arrives"""
+    executor = get_llm_executor()
+    futures = {executor.submit(calculate_job_match_score, job, resume_text): job for job in jobs}
+    for future in as_completed(futures):
+        job = futures[future]
+        job['match_score'] = future.result()
+        yield job
+
+def build_summary_email(jobs_list, resume, resume_filename):
+    """Summary email to RECIPIENT_EMAIL with the resume and the job list as a CSV"""
+    msg = MIMEMultipart()
+    msg['From'] = EMAIL_ADDRESS
+    msg['To'] = RECIPIENT_EMAIL
+    msg['Subject'] = f"Job Applications Submitted - {len(jobs_list)} Positions"
+    
+    # Create email body
+    body = f"""Dear Team,
 
 I have successfully applied to {len(jobs_list)} job positions through the AI Resume Analyzer system.
 
@@ -725,76 +795,198 @@ The CSV file contains all the job details including:
 Thank you for your consideration.
 
 Best regards,
-Prakhar Gupta
+{APPLICANT_NAME}
 Generated via AI Resume Analyzer
 """
+    
+    msg.attach(MIMEText(body, 'plain'))
+    
+    # Attach the resume (already encoded once for all applications)
+    if resume is not None:
+        msg.attach(resume.part())
+    
+    # Create and attach the CSV file
+    jobs_df = jobs_list if isinstance(jobs_list, pd.DataFrame) else pd.DataFrame(jobs_list)
+    part = MIMEText(jobs_df.to_csv(index=False), 'plain')
+    part.add_header(
+        'Content-Disposition',
+        f'attachment; filename="job_applications_{pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")}.csv"',
+    )
+    msg.attach(part)
+    return msg
+
+def send_application_email(jobs_list, resume_file, resume_filename):
+    """Queue one personalized application per job to its EmailID; returns (success, message, job_id)
+    
+    Jobs already in the application ledger are skipped and the rest are
+    claimed there before sending, so sends are idempotent across clicks
+    and restarts. The resume is encoded once and shared by every message,
+    and a summary with the job list as a CSV goes to RECIPIENT_EMAIL when
+    it is set. Messages are sent by the background mailer (at most
+    SMTP_POOL_SIZE at a time), so this returns as soon as they are built;
+    poll get_mailer().status(job_id) for progress.
+    """
+    try:
+        # Check if email password is configured
+        if not EMAIL_PASSWORD:
+            return False, "Email password not configured. Please add EMAIL_PASSWORD to your .env file.", None
         
-        msg.attach(MIMEText(body, 'plain'))
+        if isinstance(jobs_list, pd.DataFrame):
+            jobs_list = jobs_list.to_dict('records')
         
-        # Attach the resume
+        # Encode the resume once for every message
+        resume = None
         if resume_file is not None:
             try:
                 # Reset file pointer to beginning
                 resume_file.seek(0)
-                
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(resume_file.read())
-                encoders.encode_base64(part)
-                part.add_header(
-                    'Content-Disposition',
-                    f'attachment; filename="{resume_filename}"',
-                )
-                msg.attach(part)
+                resume = ResumeAttachment(resume_file.read(), resume_filename)
             except Exception as e:
-                return False, f"Error attaching resume: {str(e)}"
+                return False, f"Error attaching resume: {str(e)}", None
         
-        # Create and attach the CSV file
-        try:
-            # Convert jobs_list to DataFrame
-            if isinstance(jobs_list, pd.DataFrame):
-                jobs_df = jobs_list
-            else:
-                jobs_df = pd.DataFrame(jobs_list)
-            
-            # Create CSV content
-            csv_content = jobs_df.to_csv(index=False)
-            
-            # Attach CSV as text
-            part = MIMEText(csv_content, 'plain')
-            part.add_header(
-                'Content-Disposition',
-                f'attachment; filename="job_applications_{pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")}.csv"',
-            )
-            msg.attach(part)
-            
-        except Exception as e:
-            return False, f"Error creating CSV attachment: {str(e)}"
+        contactable = [job for job in jobs_list if is_valid_email(job.get('EmailID'))]
+        skipped = len(jobs_list) - len(contactable)
+        
+        # Claim the jobs in the ledger first, so nothing already applied to is ever sent again
+        ledger = get_application_ledger()
+        claimed = ledger.claim(contactable)
+        already_applied = len(contactable) - len(claimed)
+        if not claimed:
+            if already_applied:
+                return False, f"Already applied to all {already_applied} selected jobs.", None
+            return False, "None of the selected jobs has a valid contact email.", None
+        
+        messages = []
+        keys_by_message = {}
+        for key, job in claimed.items():
+            msg = build_application(job, resume, EMAIL_ADDRESS)
+            keys_by_message[id(msg)] = key
+            messages.append(msg)
+        applied = list(claimed.values())
         
-        # Send email
+        if RECIPIENT_EMAIL:
+            try:
+                messages.append(build_summary_email(applied, resume, resume_filename))
+            except Exception as e:
+                ledger.mark(claimed, 'failed', e)
+                return False, f"Error creating CSV attachment: {str(e)}", None
+        
+        def record_result(message, error):
+            key = keys_by_message.get(id(message))
+            if key is not None:
+                ledger.mark([key], 'failed' if error else 'sent', error)
+        
+        # Hand off to the background mailer
         try:
-            server = smtplib.SMTP('smtp.gmail.com', 587)
-            server.starttls()
-            server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-            text = msg.as_string()
-            server.sendmail(EMAIL_ADDRESS, RECIPIENT_EMAIL, text)
-            server.quit()
-            
-            return True, f"Email sent successfully to {RECIPIENT_EMAIL}! Applied to {len(jobs_list)} positions with resume and CSV attached."
-            
-        except Exception as e:
-            return False, f"Error sending email: {str(e)}"
+            job_id = get_mailer().submit(messages, on_result=record_result)
+        except Exception:
+            ledger.mark(claimed, 'failed', "Could not queue the email")
+            raise
+        message = f"Queued {len(applied)} personalized applications (job {job_id})"
+        if already_applied:
+            message += f"; skipped {already_applied} jobs already applied to"
+        if skipped:
+            message += f"; skipped {skipped} jobs without a valid contact email"
+        if RECIPIENT_EMAIL:
+            message += f", with a summary to {RECIPIENT_EMAIL}"
+        return True, message + ".", job_id
         
     except Exception as e:
-        return False, f"Unexpected error: {str(e)}"
+        return False, f"Unexpected error: {str(e)}", None
 
-def analyze_resume(extracted_text):
-    """Analyze resume using Groq API"""
+def display_mail_jobs(job_ids):
+    """Show the progress of this session's queued application emails"""
+    mailer = get_mailer()
+    for job_id in reversed(job_ids):
+        job = mailer.status(job_id)
+        if job is None:
+            continue
+        label = f"Email job {job_id}: {job['status']} ({job['sent']}/{job['total']} sent"
+        label += f", {job['failed']} failed)" if job['failed'] else ")"
+        if job['status'] == 'sent':
+            st.success(f"✅ {label}")
+        elif job['status'] in ('failed', 'partial'):
+            st.error(f"❌ {label}: {'; '.join(job['errors'])}")
+        else:
+            st.info(f"📤 {label}")
+
+def poll_task(task_id, label, render_partial=None):
+    """Show a background task's progress; returns the task (with its result) once it is done
+    
+    While the task is queued or running, a fragment re-polls it every
+    TASK_POLL_INTERVAL seconds without rerunning the page, then reruns
+    the page once it finishes. Returns None until then, or if it failed.
+    render_partial(result) draws any partial result the task has published.
+    """
+    if not task_id:
+        return None
+    task = get_task_queue().get(task_id, with_result=False)
+    if task is None:
+        st.warning(f"⚠️ Task {task_id} not found.")
+        return None
+    if task['status'] == 'failed':
+        st.error(f"❌ {label} failed: {task['error']}")
+        return None
+    if task['status'] == 'done':
+        return get_task_queue().get(task_id)
+    show_task_progress(task_id, label, render_partial)
+    return None
+
+@st.fragment(run_every=TASK_POLL_INTERVAL)
+def show_task_progress(task_id, label, render_partial=None):
+    task = get_task_queue().get(task_id, with_result=render_partial is not None)
+    if task is None:
+        st.warning(f"⚠️ Task {task_id} not found.")
+        return
+    if task['status'] in FINISHED_STATUSES:
+        st.rerun()
+    st.info(f"⏳ {label} (task {task_id}): {task['progress']}")
+    if render_partial is not None and task.get('result'):
+        render_partial(task['result'])
+
+def stream_llm_answer(kind, extracted_text, error_prefix, messages, model, temperature):
+    """Yield a Groq answer chunk by chunk as it streams, caching the full text
+    
+    A cached answer is yielded as a single chunk. Errors end the stream
+    with an error message instead of raising.
+    """
     try:
-        response = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an expert career counselor and resume analyst. Provide comprehensive insights about the resume including:
+        cache = get_llm_cache()
+        cache_key = cache.make_key(kind, extracted_text, model, PROMPT_VERSIONS[kind], temperature)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
+        # Shared RPM/TPM limiter with jittered retries on 429; the limit applies when the stream is opened
+        stream = call_with_retry(
+            lambda: client.chat.completions.create(
+                messages=messages,
+                model=model,
+                temperature=temperature,
+                stream=True
+            ),
+            get_groq_limiter(),
+            estimate_tokens(*[message["content"] for message in messages], completion_tokens=1000)
+        )
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+        cache.put(cache_key, kind, "".join(parts))
+    except Exception as e:
+        yield f"{error_prefix}: {str(e)}"
+
+def analyze_resume(extracted_text, stream=False):
+    """Analyze resume using Groq API (stream=True returns an iterator of text chunks)"""
+    chunks = stream_llm_answer(
+        'analyze_resume', extracted_text, "Analysis error",
+        messages=[
+            {
+                "role": "system",
+                "content": """You are an expert career counselor and resume analyst. Provide comprehensive insights about the resume including:
                     1. Overall assessment and strengths
                     2. Areas for improvement
                     3. Suitable job roles and industries
@@ -804,10 +996,10 @@ def analyze_resume(extracted_text):
                     7. Market competitiveness analysis
                     
                     Format your response in clear sections with actionable recommendations."""
-                },
-                {
-                    "role": "user", 
-                    "content": f"""Please analyze this resume comprehensively. The person wants to understand:
+            },
+            {
+                "role": "user", 
+                "content": f"""Please analyze this resume comprehensively. The person wants to understand:
                     - What are their key strengths and skills?
                     - What types of jobs/roles would be best suited for them?
                     - What industries should they target?
@@ -817,23 +1009,21 @@ def analyze_resume(extracted_text):
                     
                     Resume content:
                     {extracted_text}"""
-                }
-            ],
-            model="llama3-70b-8192",
-            temperature=0.7
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        return f"Analysis error: {str(e)}"
+            }
+        ],
+        model="llama3-70b-8192",
+        temperature=0.7
+    )
+    return chunks if stream else "".join(chunks)
 
-def calculate_ats_score(extracted_text):
-    """Calculate ATS score and provide detailed breakdown"""
-    try:
-        response = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an ATS (Applicant Tracking System) expert. Analyze the resume and provide:
+def calculate_ats_score(extracted_text, stream=False):
+    """Calculate ATS score and provide detailed breakdown (stream=True returns an iterator of text chunks)"""
+    chunks = stream_llm_answer(
+        'ats_score', extracted_text, "ATS scoring error",
+        messages=[
+            {
+                "role": "system",
+                "content": """You are an ATS (Applicant Tracking System) expert. Analyze the resume and provide:
                     1. Overall ATS Score (0-100)
                     2. Detailed breakdown of scoring criteria
                     3. Specific recommendations to improve ATS compatibility
@@ -841,10 +1031,10 @@ def calculate_ats_score(extracted_text):
                     5. Formatting issues that might cause problems
                     
                     Be precise and actionable in your recommendations."""
-                },
-                {
-                    "role": "user", 
-                    "content": f"""Please analyze this resume for ATS compatibility and provide a detailed score breakdown:
+            },
+            {
+                "role": "user", 
+                "content": f"""Please analyze this resume for ATS compatibility and provide a detailed score breakdown:
 
                     Evaluate based on:
                     - Contact information completeness
@@ -863,14 +1053,151 @@ def calculate_ats_score(extracted_text):
                     
                     Resume content:
                     {extracted_text}"""
-                }
-            ],
-            model="llama3-70b-8192",
-            temperature=0.3
-        )
-        return response.choices[0].message.content
+            }
+        ],
+        model="llama3-70b-8192",
+        temperature=0.3
+    )
+    return chunks if stream else "".join(chunks)
+
+class StreamedAnswer:
+    """LLM answer streamed by a worker thread and drained by the Streamlit script thread
+    
+    Streamlit calls only work from the script thread, so the worker just
+    queues chunks and the script renders whatever has arrived.
+    """
+    
+    def __init__(self, chunks):
+        self.chunks = queue.Queue()
+        self.text = ""
+        self.done = False
+        get_llm_executor().submit(self.pump, chunks)
+    
+    def pump(self, chunks):
+        try:
+            for chunk in chunks:
+                self.chunks.put(chunk)
+        finally:
+            self.chunks.put(None)  # End of stream
+    
+    def drain(self):
+        """Append every chunk received so far; returns True if the text changed"""
+        changed = False
+        while not self.done:
+            try:
+                chunk = self.chunks.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None:
+                self.done = True
+            else:
+                self.text += chunk
+                changed = True
+        return changed
+
+def start_resume_pipeline(extracted_text):
+    """Start resume analysis, ATS scoring and keyword extraction together
+    
+    The calls run on the shared Groq worker pool, so uploads in a batch
+    are processed concurrently under its global cap. 'analysis' and 'ats'
+    are StreamedAnswers, 'keyword' is a future.
+    """
+    executor = get_llm_executor()
+    return {
+        'analysis': StreamedAnswer(analyze_resume(extracted_text, stream=True)),
+        'ats': StreamedAnswer(calculate_ats_score(extracted_text, stream=True)),
+        'keyword': executor.submit(extract_resume_keywords, extracted_text)
+    }
+
+def wait_for_keyword(pipeline):
+    """Search keyword of a started resume pipeline, showing extraction errors on the page"""
+    try:
+        return pipeline['keyword'].result()
     except Exception as e:
-        return f"ATS scoring error: {str(e)}"
+        st.error(f"Error extracting keyword: {str(e)}")
+        return ""
+
+def display_resume_analysis(analysis):
+    """Display the resume analysis insights"""
+    st.markdown('<div class="insight-card">', unsafe_allow_html=True)
+    st.markdown(analysis)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def split_ats_score(ats_analysis, complete_lines_only=False):
+    """Return (score_value, detailed_analysis), with score_value None if no "ATS Score:" line is found
+    
+    With complete_lines_only the last line is ignored, since a streamed
+    answer may still be in the middle of it.
+    """
+    lines = ats_analysis.split('\n')
+    if complete_lines_only:
+        lines = lines[:-1]
+    for line in lines:
+        if "ATS Score:" in line:
+            score_value = line.split(':')[1].strip().split('/')[0].strip()
+            return score_value, ats_analysis.replace(line, "").strip()
+    return None, ats_analysis
+
+def display_ats_score(score_value):
+    """Display the ATS score prominently"""
+    st.markdown(f'''
+    <div class="ats-score-container">
+        <div class="ats-score-label">ATS Compatibility Score</div>
+        <div class="ats-score-number">{score_value}/100</div>
+        <div class="ats-score-label">Higher scores mean better ATS compatibility</div>
+    </div>
+    ''', unsafe_allow_html=True)
+
+def display_ats_breakdown(detailed_analysis):
+    """Display the detailed ATS score breakdown"""
+    st.markdown('<div class="score-breakdown">', unsafe_allow_html=True)
+    st.markdown("#### 📊 Detailed Score Breakdown")
+    st.markdown(detailed_analysis)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def stream_resume_reports(pipeline, analysis_slot, ats_score_slot, ats_slot, poll_interval=0.05):
+    """Render the analysis and ATS answers into their slots as tokens arrive
+    
+    The ATS score card is shown as soon as the "ATS Score:" line is
+    complete, while the breakdown below it is still streaming.
+    """
+    analysis, ats = pipeline['analysis'], pipeline['ats']
+    score_shown = False
+    while not (analysis.done and ats.done):
+        if analysis.drain():
+            analysis_slot.markdown(analysis.text + " ▌")
+        if ats.drain():
+            score_value, detailed_analysis = split_ats_score(ats.text, complete_lines_only=not ats.done)
+            if score_value and not score_shown:
+                with ats_score_slot.container():
+                    display_ats_score(score_value)
+                score_shown = True
+            ats_slot.markdown((detailed_analysis if score_value else ats.text) + " ▌")
+        time.sleep(poll_interval)
+    
+    # Final render with the full formatting
+    with analysis_slot.container():
+        display_resume_analysis(analysis.text)
+    score_value, detailed_analysis = split_ats_score(ats.text)
+    if score_value and not score_shown:
+        with ats_score_slot.container():
+            display_ats_score(score_value)
+    with ats_slot.container():
+        display_ats_breakdown(detailed_analysis)
+
+def scraped_job_card(job):
+    """Scraped job row in the format expected by display_job_card and the match scorers"""
+    return {
+        'title': job.get('Role', 'N/A'),
+        'company': job.get('Company', 'N/A'),
+        'location': job.get('Location', 'N/A'),
+        'description': f"Stipend: {job.get('Stipend (₹/month)', 'N/A')}",
+        'apply_link': job.get('Apply Link', '#'),
+        'source': 'Web Scraper',
+        'posted_date': 'Recently',
+        'job_type': 'Internship',
+        'match_score': 7  # Default score
+    }
 
 def display_job_card(job):
     """Display a single job card with Google Jobs data"""
@@ -906,7 +1233,14 @@ def display_job_card(job):
     </div>
     ''', unsafe_allow_html=True)
 
+def display_scored_jobs_so_far(jobs):
+    """Cards of the jobs scored so far, best first, while scoring is still running"""
+    st.markdown(f"#### 📋 {len(jobs)} Top Matches Scored So Far")
+    for job in jobs:
+        display_job_card(job)
+
 def app():
+    setup_page()
     st.markdown('<div class="main-container">', unsafe_allow_html=True)
     
     # Header
@@ -942,58 +1276,32 @@ def app():
     
     # Process uploaded files
     if uploaded_files:
-        for uploaded_file in uploaded_files:
+        # Read every upload, then start the LLM calls for the whole batch at once
+        with st.spinner(f"📄 Reading {len(uploaded_files)} resume(s)..."):
+            extracted_texts = [extract_text_from_pdf(uploaded_file) for uploaded_file in uploaded_files]
+        pipelines = [start_resume_pipeline(text) if text else None for text in extracted_texts]
+        
+        for uploaded_file, extracted_text, pipeline in zip(uploaded_files, extracted_texts, pipelines):
             st.markdown(f"### 📊 Analysis for: {uploaded_file.name}")
             
             with st.spinner(f"🔍 Analyzing {uploaded_file.name}..."):
-                extracted_text = extract_text_from_pdf(uploaded_file)
-                
                 if extracted_text:
                     # Create tabs for different analyses
                     tab1, tab2, tab3, tab4 = st.tabs(["📋 Resume Analysis", "🎯 ATS Score", "💼 Agent Job Matches", "🔍 Raw Text"])
                     
                     with tab1:
                         st.markdown("#### 🎯 Comprehensive Resume Analysis")
-                        with st.spinner("Generating insights..."):
-                            analysis = analyze_resume(extracted_text)
-                            
-                        st.markdown('<div class="insight-card">', unsafe_allow_html=True)
-                        st.markdown(analysis)
-                        st.markdown('</div>', unsafe_allow_html=True)
+                        analysis_slot = st.empty()
+                        analysis_slot.info("⏳ Generating insights...")
                     
                     with tab2:
                         st.markdown("#### 🎯 ATS Compatibility Score")
-                        with st.spinner("Calculating ATS score..."):
-                            ats_analysis = calculate_ats_score(extracted_text)
-                            
-                        # Extract the score from the response
-                        score_line = ""
-                        detailed_analysis = ats_analysis
-                        
-                        if "ATS Score:" in ats_analysis:
-                            lines = ats_analysis.split('\n')
-                            for line in lines:
-                                if "ATS Score:" in line:
-                                    score_line = line
-                                    detailed_analysis = ats_analysis.replace(line, "").strip()
-                                    break
-                        
-                        # Display score prominently
-                        if score_line:
-                            score_value = score_line.split(':')[1].strip().split('/')[0].strip()
-                            st.markdown(f'''
-                            <div class="ats-score-container">
-                                <div class="ats-score-label">ATS Compatibility Score</div>
-                                <div class="ats-score-number">{score_value}/100</div>
-                                <div class="ats-score-label">Higher scores mean better ATS compatibility</div>
-                            </div>
-                            ''', unsafe_allow_html=True)
-                        
-                        # Display detailed breakdown
-                        st.markdown('<div class="score-breakdown">', unsafe_allow_html=True)
-                        st.markdown("#### 📊 Detailed Score Breakdown")
-                        st.markdown(detailed_analysis)
-                        st.markdown('</div>', unsafe_allow_html=True)
+                        ats_score_slot = st.empty()
+                        ats_slot = st.empty()
+                        ats_slot.info("⏳ Calculating ATS score...")
+                    
+                    # Stream both answers into their tabs token by token
+                    stream_resume_reports(pipeline, analysis_slot, ats_score_slot, ats_slot)
                     
                     with tab3:
                         st.markdown("#### 💼 Agent Job Matches Results")
@@ -1008,16 +1316,26 @@ def app():
                         with search_tab1:
                             # Extract keyword for job search
                             with st.spinner("Extracting keyword from your resume..."):
-                                keyword = extract_resume_keywords(extracted_text)
+                                keyword = wait_for_keyword(pipeline)
                             
                             if keyword:
                                 st.info(f"🔍 **Search Keyword Extracted:** {keyword}")
                                 
+                                force_refresh = st.checkbox("Force fresh scrape (bypass cache)", key=f"force_refresh_{uploaded_file.name}")
+                                
+                                scrape_task_key = f"scrape_task_{uploaded_file.name}"
                                 if st.button("🔍 Scrape Jobs", key=f"scrape_jobs_{uploaded_file.name}"):
-                                    with st.spinner(f"Scraping jobs for keyword: {keyword}..."):
-                                        jobs_df = run_scraper_with_keyword(keyword)
+                                    # Scrape in a background worker; the task survives reruns and closed tabs
+                                    task_id = submit_task('scrape', {'keyword': keyword, 'use_cache': not force_refresh})
+                                    st.session_state[scrape_task_key] = task_id
+                                    st.query_params[scrape_task_key] = task_id
+                                
+                                scrape_task = poll_task(st.session_state.get(scrape_task_key) or st.query_params.get(scrape_task_key),
+                                                        f"Scraping jobs for keyword: {keyword}")
+                                if scrape_task is not None:
+                                    jobs_df = pd.DataFrame(scrape_task['result'])
                                     
-                                    if jobs_df is not None and not jobs_df.empty:
+                                    if not jobs_df.empty:
                                         st.success(f"✅ Found {len(jobs_df)} job opportunities!")
                                         
                                         # Add filters
@@ -1047,18 +1365,24 @@ def app():
                                         if selected_role != 'All':
                                             filtered_jobs = filtered_jobs[filtered_jobs['Role'] == selected_role]
                                         
+                                        # Hide jobs already applied to (one set lookup per job)
+                                        applied_keys = get_application_ledger().applied_keys()
+                                        already_applied = filtered_jobs['Apply Link'].map(link_key).isin(applied_keys)
+                                        if already_applied.any():
+                                            st.caption(f"✔️ Hiding {int(already_applied.sum())} jobs you have already applied to")
+                                            filtered_jobs = filtered_jobs[~already_applied]
+                                        
                                         # Apply All button
-                                        if st.button("📧 Apply to All", key=f"apply_all_{uploaded_file.name}", help="Send email application for all filtered jobs"):
+                                        if st.button("📧 Apply to All", key=f"apply_all_{uploaded_file.name}", help="Email a personalized application to each filtered job's contact address"):
                                             if EMAIL_PASSWORD:
                                                 if len(filtered_jobs) > 0:
-                                                    with st.spinner("Sending application emails..."):
-                                                        # Convert DataFrame rows to list of dictionaries
-                                                        jobs_list = filtered_jobs.to_dict('records')
-                                                        success, message = send_application_email(jobs_list, uploaded_file, uploaded_file.name)
+                                                    # Convert DataFrame rows to list of dictionaries
+                                                    jobs_list = filtered_jobs.to_dict('records')
+                                                    success, message, job_id = send_application_email(jobs_list, uploaded_file, uploaded_file.name)
                                                         
                                                     if success:
-                                                        st.success(f"✅ {message}")
-                                                        st.info(f"📧 Applied to {len(filtered_jobs)} positions via email!")
+                                                        st.session_state.setdefault('mail_jobs', []).append(job_id)
+                                                        st.info(f"📧 {message}")
                                                     else:
                                                         st.error(f"❌ {message}")
                                                 else:
@@ -1066,25 +1390,18 @@ def app():
                                             else:
                                                 st.error("❌ Email password not configured. Please add EMAIL_PASSWORD to your .env file.")
                                         
+                                        # Status of emails queued this session, refreshed on every rerun
+                                        if st.session_state.get('mail_jobs'):
+                                            display_mail_jobs(st.session_state['mail_jobs'])
+                                            st.button("🔄 Refresh email status", key=f"mail_status_{uploaded_file.name}")
+                                        
                                         st.markdown('</div>', unsafe_allow_html=True)
                                         
                                         # Display filtered jobs
                                         st.markdown(f"#### 📋 Showing {len(filtered_jobs)} Jobs")
                                         
                                         for _, job in filtered_jobs.iterrows():
-                                            # Create a job dictionary in the format expected by display_job_card
-                                            job_dict = {
-                                                'title': job.get('Role', 'N/A'),
-                                                'company': job.get('Company', 'N/A'),
-                                                'location': job.get('Location', 'N/A'),
-                                                'description': f"Stipend: {job.get('Stipend (₹/month)', 'N/A')}",
-                                                'apply_link': job.get('Apply Link', '#'),
-                                                'source': 'Web Scraper',
-                                                'posted_date': 'Recently',
-                                                'job_type': 'Internship',
-                                                'match_score': 7  # Default score
-                                            }
-                                            display_job_card(job_dict)
+                                            display_job_card(scraped_job_card(job))
                                     else:
                                         st.error("❌ No jobs found. Try a different keyword or check if the scraper is working properly.")
                             else:
@@ -1109,11 +1426,12 @@ def app():
                                 with col3:
                                     num_results = st.slider("Number of Results", 10, 50, 20)
                                 
+                                score_task_key = f"score_task_{uploaded_file.name}"
                                 with col4:
                                     if st.button("🔍 Search Jobs", key=f"search_jobs_{uploaded_file.name}"):
                                         # Extract keywords and search for jobs
                                         with st.spinner("Extracting keywords from your resume..."):
-                                            keyword = extract_resume_keywords(extracted_text)
+                                            keyword = wait_for_keyword(pipeline)
                                         
                                         if keyword:
                                             st.info(f"🔍 **Search Keyword Extracted:** {keyword}")
@@ -1121,51 +1439,58 @@ def app():
                                             with st.spinner(f"Searching for jobs matching: {keyword}..."):
                                                 jobs = search_jobs_with_serpapi(keyword, location, job_type, num_results)
                                             
+                                            # Skip jobs already applied to before spending LLM calls on them
+                                            applied_keys = get_application_ledger().applied_keys()
+                                            fresh_jobs = [job for job in jobs if link_key(job.get('apply_link', '')) not in applied_keys]
+                                            if len(fresh_jobs) < len(jobs):
+                                                st.caption(f"✔️ Skipping {len(jobs) - len(fresh_jobs)} jobs you have already applied to")
+                                            jobs = fresh_jobs
+                                            
                                             if jobs:
                                                 st.success(f"✅ Found {len(jobs)} job opportunities!")
                                                 
-                                                # Calculate match scores for all jobs
-                                                with st.spinner("Calculating job match scores..."):
-                                                    for job in jobs:
-                                                        job['match_score'] = calculate_job_match_score(job, extracted_text)
-                                                
-                                                # Sort jobs by match score
-                                                jobs.sort(key=lambda x: x['match_score'], reverse=True)
-                                                
-                                                # Add filters
-                                                st.markdown('<div class="filter-container">', unsafe_allow_html=True)
-                                                st.markdown("#### 🔍 Filter Results")
-                                                
-                                                col1, col2, col3 = st.columns(3)
-                                                
-                                                with col1:
-                                                    companies = ['All'] + list(set([job.get('company', 'N/A') for job in jobs]))
-                                                    selected_company = st.selectbox("Company", companies, key="serpapi_company")
-                                                
-                                                with col2:
-                                                    locations = ['All'] + list(set([job.get('location', 'N/A') for job in jobs]))
-                                                    selected_location = st.selectbox("Job Location", locations, key="serpapi_location")
-                                                
-                                                with col3:
-                                                    min_score = st.slider("Minimum Match Score", 1, 10, 5, key="serpapi_score")
-                                                
-                                                # Filter jobs based on selections
-                                                filtered_jobs = jobs
-                                                if selected_company != 'All':
-                                                    filtered_jobs = [job for job in filtered_jobs if job.get('company') == selected_company]
-                                                if selected_location != 'All':
-                                                    filtered_jobs = [job for job in filtered_jobs if job.get('location') == selected_location]
-                                                filtered_jobs = [job for job in filtered_jobs if job.get('match_score', 0) >= min_score]
-                                                
-                                                # Display filtered jobs
-                                                st.markdown(f"#### 📋 Showing {len(filtered_jobs)} Jobs")
-                                                
-                                                for job in filtered_jobs:
-                                                    display_job_card(job)
+                                                # Score in a background worker: local pre-filter, then LLM re-rank of the top candidates
+                                                st.session_state[score_task_key] = submit_task('score', {'jobs': jobs, 'resume_text': extracted_text})
                                             else:
                                                 st.warning("⚠️ No matching jobs found. Try updating your resume with more relevant keywords.")
                                         else:
                                             st.error("❌ Could not extract a keyword from your resume.")
+                                
+                                score_task = poll_task(st.session_state.get(score_task_key), "Scoring job matches",
+                                                       render_partial=display_scored_jobs_so_far)
+                                if score_task is not None:
+                                    jobs = score_task['result']
+                                    
+                                    # Add filters
+                                    st.markdown('<div class="filter-container">', unsafe_allow_html=True)
+                                    st.markdown("#### 🔍 Filter Results")
+                                    
+                                    col1, col2, col3 = st.columns(3)
+                                    
+                                    with col1:
+                                        companies = ['All'] + list(set([job.get('company', 'N/A') for job in jobs]))
+                                        selected_company = st.selectbox("Company", companies, key="serpapi_company")
+                                    
+                                    with col2:
+                                        locations = ['All'] + list(set([job.get('location', 'N/A') for job in jobs]))
+                                        selected_location = st.selectbox("Job Location", locations, key="serpapi_location")
+                                    
+                                    with col3:
+                                        min_score = st.slider("Minimum Match Score", 1, 10, 5, key="serpapi_score")
+                                    
+                                    # Filter jobs based on selections
+                                    filtered_jobs = jobs
+                                    if selected_company != 'All':
+                                        filtered_jobs = [job for job in filtered_jobs if job.get('company') == selected_company]
+                                    if selected_location != 'All':
+                                        filtered_jobs = [job for job in filtered_jobs if job.get('location') == selected_location]
+                                    filtered_jobs = [job for job in filtered_jobs if job.get('match_score', 0) >= min_score]
+                                    
+                                    # Display filtered jobs
+                                    st.markdown(f"#### 📋 Showing {len(filtered_jobs)} Jobs")
+                                    
+                                    for job in filtered_jobs:
+                                        display_job_card(job)
                             else:
                                 st.error("❌ SerpAPI API key not found. Please add SERPAPI_API_KEY to your .env file to enable Google Jobs search.")
                                 st.info("💡 Get your free API key from: https://serpapi.com/")
@@ -1192,6 +1517,9 @@ def app():
         </div>
         """, unsafe_allow_html=True)
         
+        cache_stats = get_llm_cache().stats()
+        st.caption(f"🧠 Analysis cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses ({cache_stats['entries']} cached answers)")
+        
         st.markdown('</div>', unsafe_allow_html=True)
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from job_store import link_key
+
+APPLICATION_LEDGER_PATH = os.getenv('APPLICATION_LEDGER_PATH', os.path.join('.cache', 'applications.db'))
+
+# Applications in these states are never sent again; 'failed' ones may be retried
+APPLIED_STATUSES = ('queued', 'sent')
+
+
+class ApplicationLedger:
+    """Durable record of every job applied to, keyed by normalized apply link
+
+    A job is claimed ('queued') in the same transaction that checks it
+    was not applied to before, and only claimed jobs are emailed, so
+    repeated clicks, reruns, rescrapes and other sessions or processes
+    never send the same application twice. The mailer then moves each
+    claim to 'sent' or 'failed'; failed ones are claimable again.
+    A crash between claim and send leaves a 'queued' row that is not
+    retried: a missed application is cheaper than a duplicate one.
+    """
+
+    def __init__(self, path=APPLICATION_LEDGER_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS applications (
+                    app_key TEXT PRIMARY KEY,
+                    apply_link TEXT,
+                    company TEXT,
+                    role TEXT,
+                    email TEXT,
+                    status TEXT,
+                    attempts INTEGER,
+                    error TEXT,
+                    first_attempt REAL,
+                    last_attempt REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status)")
+
+    @contextmanager
+    def connect(self):
+        """Short-lived connection committed on success, so any thread or process can use the ledger"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def applied_keys(self):
+        """Set of app keys (link_key of the apply link) that must not be applied to again"""
+        placeholders = ','.join('?' * len(APPLIED_STATUSES))
+        with self.connect() as conn:
+            return {row[0] for row in conn.execute(
+                f"SELECT app_key FROM applications WHERE status IN ({placeholders})", APPLIED_STATUSES)}
+
+    def claim(self, jobs, attempted_at=None):
+        """Mark jobs as queued unless already applied to; returns {app_key: job} of the claimed ones
+
+        Jobs sharing an apply link are claimed once.
+        """
+        now = attempted_at or time.time()
+        candidates = {}
+        for job in jobs:
+            candidates.setdefault(link_key(job.get('Apply Link', '')), job)
+        if not candidates:
+            return {}
+
+        keys = list(candidates)
+        with self.lock, self.connect() as conn:
+            # Take the write lock before reading, so concurrent processes cannot claim the same job
+            conn.execute("BEGIN IMMEDIATE")
+            applied = set()
+            placeholders = ','.join('?' * len(APPLIED_STATUSES))
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                applied.update(row[0] for row in conn.execute(
+                    f"SELECT app_key FROM applications WHERE app_key IN ({','.join('?' * len(chunk))}) "
+                    f"AND status IN ({placeholders})", chunk + list(APPLIED_STATUSES)))
+
+            claimed = {key: job for key, job in candidates.items() if key not in applied}
+            conn.executemany("""
+                INSERT INTO applications VALUES (?, ?, ?, ?, ?, 'queued', 1, NULL, ?, ?)
+                ON CONFLICT(app_key) DO UPDATE SET
+                    status = 'queued',
+                    attempts = applications.attempts + 1,
+                    error = NULL,
+                    email = excluded.email,
+                    last_attempt = excluded.last_attempt
+            """, [(key, *(self.text(job.get(field)) for field in ('Apply Link', 'Company', 'Role', 'EmailID')), now, now)
+                  for key, job in claimed.items()])
+        return claimed
+
+    @staticmethod
+    def text(value):
+        return None if value is None or value != value else str(value)
+
+    def mark(self, keys, status, error=None):
+        """Set the status of claimed applications ('sent' or 'failed')"""
+        keys = list(keys)
+        if not keys:
+            return
+        with self.lock, self.connect() as conn:
+            conn.executemany("UPDATE applications SET status = ?, error = ?, last_attempt = ? WHERE app_key = ?",
+                             [(status, None if error is None else str(error), time.time(), key) for key in keys])
+
+    def status_counts(self):
+        with self.connect() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM applications GROUP BY status"))
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_application_ledger():
+    """Process-wide ApplicationLedger (the SQLite file itself is shared across processes)"""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = ApplicationLedger()
+        return _ledger
@@ -0,0 +1,70 @@
+"""Time fuzzy job dedup on a synthetic corpus of accumulated listings
+
+Usage: python benchmarks/dedup.py [listings] [companies]
+
+Each listing is drawn from a small set of roles and cities, and about a
+third are rewritten the way other portals phrase them ("SDE Intern" vs
+"Software Development Engineer Internship", "Pvt Ltd" suffixes, city
+aliases), so the corpus has both exact and near duplicates.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import dedupe_jobs
+
+ROLES = [
+    ("SDE Intern", "Software Development Engineer Internship"),
+    ("Python Dev", "Python Developer"),
+    ("ML Engineer", "Machine Learning Engineer"),
+    ("Sr. Data Analyst", "Senior Data Analyst"),
+    ("Full Stack Developer", "Fullstack Developer"),
+    ("QA Engineer", "Quality Assurance Engineer"),
+    ("Frontend Developer Intern", "Front End Developer Intern"),
+    ("Business Analyst", "Business Analyst"),
+]
+CITIES = [("Bengaluru", "Bangalore, Karnataka"), ("Gurugram", "Gurgaon, Haryana"), ("Mumbai", "Mumbai, Maharashtra"),
+          ("Pune", "Pune, Maharashtra"), ("Hyderabad", "Hyderabad, Telangana")]
+
+
+def make_corpus(listings, companies, seed=0):
+    """Returns (jobs, number of distinct postings behind them)"""
+    rng = random.Random(seed)
+    jobs = []
+    postings = set()
+    for i in range(listings):
+        variant = 1 if rng.random() < 0.35 else 0
+        company, role, city = rng.randrange(companies), rng.randrange(len(ROLES)), rng.randrange(len(CITIES))
+        postings.add((company, role, city))
+        jobs.append({
+            'Company': f"Company {company}" + (" Pvt. Ltd." if variant else ""),
+            'Role': ROLES[role][variant],
+            'Location': CITIES[city][variant],
+            'Stipend (₹/month)': rng.choice(["N/A", "₹10,000", "₹15,000 - ₹20,000"]),
+            'Apply Link': f"https://example.com/jobs/{i}",
+            'EmailID': f"careers@company{i}.com",
+            'Source': rng.choice(["Naukri", "LinkedIn", "Internshala", "Glassdoor"]),
+        })
+    return jobs, len(postings)
+
+
+def main():
+    listings = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    companies = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    jobs, postings = make_corpus(listings, companies)
+
+    start = time.perf_counter()
+    unique = dedupe_jobs(jobs)
+    elapsed = time.perf_counter() - start
+
+    exact = len({(job['Company'].lower(), job['Role'].lower()) for job in jobs})
+    print(f"{listings} listings of {postings} distinct postings from {companies} companies")
+    print(f"exact (company, role) dedup: {exact} unique")
+    print(f"fuzzy dedup:                 {len(unique)} unique in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compare Internshala page latency and Chrome RSS for the full and lean driver profiles
+
+Usage: python benchmarks/selenium_profile.py [keyword] [pages]
+
+"before" is the old setup: full page loads plus the fixed 3 s sleep ahead
+of the WebDriverWait. "after" is the lean profile (eager load strategy,
+images/fonts/CSS/trackers blocked) relying only on the WebDriverWait.
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from driver_pool import create_driver, driver_rss_bytes
+
+
+def run_profile(lean, keyword, pages):
+    driver = create_driver(lean=lean)
+    latencies = []
+    peak_rss = 0
+    try:
+        for page in range(1, pages + 1):
+            url = f"https://internshala.com/internships/keywords-{keyword}/page-{page}"
+            start = time.perf_counter()
+            driver.get(url)
+            if not lean:
+                time.sleep(3)
+            try:
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, "internship_meta"))
+                )
+            except Exception:
+                print(f"  page {page}: no internship cards")
+            latencies.append(time.perf_counter() - start)
+            peak_rss = max(peak_rss, driver_rss_bytes(driver) or 0)
+    finally:
+        driver.quit()
+    return latencies, peak_rss
+
+
+def main():
+    keyword = sys.argv[1] if len(sys.argv) > 1 else "python"
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    results = {}
+    for label, lean in (("before (full + sleep)", False), ("after (lean)", True)):
+        print(f"Running {label}...")
+        results[label] = run_profile(lean, keyword, pages)
+
+    print(f"\n{'profile':<24}{'median s/page':>15}{'max s/page':>12}{'peak RSS MB':>13}")
+    for label, (latencies, peak_rss) in results.items():
+        rss = f"{peak_rss / 1024 / 1024:.0f}" if peak_rss else "n/a"
+        print(f"{label:<24}{statistics.median(latencies):>15.2f}{max(latencies):>12.2f}{rss:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Compare SMTP send throughput: one connection per message vs the pooled mailer
+
+Usage: python benchmarks/smtp_throughput.py [messages] [recipients] [--resume-kb KB] [--latency MS]
+
+Messages are personalized applications built by dispatch.py. Runs
+against a local aiosmtpd server (pip install aiosmtpd), so nothing
+leaves the machine. --latency adds a delay to every SMTP reply to mimic
+the round trips to a real provider, which is where pooling pays off.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import SMTP
+
+import mailer
+from dispatch import ResumeAttachment, build_applications
+from mailer import Mailer, SMTPConnectionPool
+
+
+class CountingHandler:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return '250 OK'
+
+
+class SlowSMTP(SMTP):
+    """aiosmtpd server that waits before every reply"""
+
+    latency = 0.0
+
+    async def push(self, status):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return await super().push(status)
+
+
+class SlowController(Controller):
+    def factory(self):
+        return SlowSMTP(self.handler, **self.SMTP_kwargs)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def make_messages(count, recipients, resume_kb):
+    """Personalized applications as the app builds them, sharing one encoded resume"""
+    resume = ResumeAttachment(os.urandom(resume_kb * 1024), 'resume.pdf')
+    jobs = [{
+        'Company': f'Company {i % recipients}',
+        'Role': 'Software Development Engineer Intern',
+        'Location': 'Bengaluru',
+        'Apply Link': f'https://example.com/jobs/{i}',
+        'EmailID': f'hr@company{i % recipients}.example.com',
+    } for i in range(count)]
+    return build_applications(jobs, resume, 'applicant@example.com')[0]
+
+
+def send_unpooled(host, port, messages):
+    """The old path: connect, send one message and quit, per message"""
+    import smtplib
+    for message in messages:
+        server = smtplib.SMTP(host, port)
+        server.send_message(message)
+        server.quit()
+
+
+def send_pooled(host, port, messages, pool_size):
+    pool = SMTPConnectionPool(host=host, port=port, starttls=False, max_size=pool_size)
+    sender = Mailer(pool)
+    job_id = sender.submit(messages)
+    job = sender.wait(job_id)
+    pool.shutdown()
+    if job['failed']:
+        print(f"  {job['failed']} messages failed: {job['errors'][:3]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('messages', nargs='?', type=int, default=200)
+    parser.add_argument('recipients', nargs='?', type=int, default=20)
+    parser.add_argument('--resume-kb', type=int, default=100, help="Size of the attached resume")
+    parser.add_argument('--latency', type=float, default=5.0, help="Delay per SMTP reply in milliseconds")
+    args = parser.parse_args()
+
+    SlowSMTP.latency = args.latency / 1000
+    handler = CountingHandler()
+    host, port = '127.0.0.1', free_port()
+    controller = SlowController(handler, hostname=host, port=port)
+    controller.start()
+    start = time.perf_counter()
+    messages = make_messages(args.messages, args.recipients, args.resume_kb)
+    build_seconds = time.perf_counter() - start
+
+    print(f"{args.messages} messages to {args.recipients} recipients with a {args.resume_kb} KB resume, "
+          f"{args.latency:.0f} ms per reply")
+    print(f"built in {build_seconds:.3f}s (resume encoded once)\n")
+    print(f"{'mode':<22}{'seconds':>10}{'msgs/sec':>12}")
+    runs = [("connection per message", lambda: send_unpooled(host, port, messages))]
+    for pool_size in sorted({1, mailer.SMTP_POOL_SIZE, 4}):
+        runs.append((f"pooled x{pool_size}", lambda size=pool_size: send_pooled(host, port, messages, size)))
+    try:
+        for label, run in runs:
+            before = handler.received
+            start = time.perf_counter()
+            run()
+            seconds = time.perf_counter() - start
+            assert handler.received - before == len(messages), "server did not receive every message"
+            print(f"{label:<22}{seconds:>10.2f}{len(messages) / seconds:>12.1f}")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import re
+
+import numpy as np
+
+from job_store import normalize_link
+
+# Trigram Jaccard similarity of normalized roles above which two postings are the same job
+ROLE_SIMILARITY = 0.75
+# MinHash signature length = LSH bands x rows per band
+LSH_BANDS = 8
+LSH_ROWS = 4
+
+PLACEHOLDERS = frozenset(['', 'n/a', 'na', 'none', 'null', 'nan', 'not specified', 'not available'])
+
+COMPANY_SUFFIXES = frozenset([
+    'pvt', 'private', 'ltd', 'limited', 'inc', 'llc', 'llp', 'corp', 'corporation', 'co', 'company', 'plc', 'gmbh',
+])
+
+ROLE_ABBREVIATIONS = {
+    'sde': 'software development engineer',
+    'swe': 'software engineer',
+    'dev': 'developer',
+    'engg': 'engineer',
+    'eng': 'engineer',
+    'mgr': 'manager',
+    'jr': 'junior',
+    'sr': 'senior',
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+    'qa': 'quality assurance',
+    'ui': 'user interface',
+    'ux': 'user experience',
+    'fullstack': 'full stack',
+    'frontend': 'front end',
+    'backend': 'back end',
+    'internship': 'intern',
+    'trainee': 'intern',
+}
+
+# Roles that differ in one of these words are different jobs, however similar the rest is
+DISTINCT_ROLE_WORDS = frozenset(['intern', 'junior', 'senior', 'lead', 'principal', 'manager', 'head', 'director'])
+
+LOCATION_ALIASES = {
+    'bengaluru': 'bangalore',
+    'gurugram': 'gurgaon',
+    'bombay': 'mumbai',
+    'new delhi': 'delhi',
+    'madras': 'chennai',
+    'calcutta': 'kolkata',
+    'work from home': 'remote',
+    'wfh': 'remote',
+}
+
+WORDS = re.compile(r'[a-z0-9+#]+')
+
+# Modulus of the universal hashes h(x) = (a*x + b) mod p; trigram codes are below 2**24
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def is_placeholder(value):
+    return value is None or str(value).strip().lower() in PLACEHOLDERS
+
+
+def normalize_company(company):
+    """'Acme Technologies Pvt. Ltd.' -> 'acme technologies'"""
+    if is_placeholder(company):
+        return ''
+    words = WORDS.findall(str(company).lower())
+    while words and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+def normalize_role(role):
+    """'SDE Intern' -> 'software development engineer intern'"""
+    if is_placeholder(role):
+        return ''
+    return ' '.join(ROLE_ABBREVIATIONS.get(word, word) for word in WORDS.findall(str(role).lower()))
+
+
+def normalize_location(location):
+    """City part of a location: 'Bengaluru, Karnataka' -> 'bangalore'"""
+    if is_placeholder(location):
+        return ''
+    city = ' '.join(WORDS.findall(str(location).split(',')[0].lower()))
+    return LOCATION_ALIASES.get(city, city)
+
+
+def locations_compatible(a, b):
+    """Unknown and remote locations match anything"""
+    return a == b or a in ('', 'remote') or b in ('', 'remote')
+
+
+def roles_match(a, b, threshold):
+    words_a, words_b = set(a.split()), set(b.split())
+    if (words_a ^ words_b) & DISTINCT_ROLE_WORDS:
+        return False
+    trigrams_a = {a[i:i + 3] for i in range(len(a) - 2)}
+    trigrams_b = {b[i:i + 3] for i in range(len(b) - 2)}
+    union = len(trigrams_a | trigrams_b)
+    return union > 0 and len(trigrams_a & trigrams_b) / union >= threshold
+
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:  # Path compression
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # The earlier record stays the root so clusters keep first-seen order
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def minhash_signatures(texts, num_perm, seed=1):
+    """MinHash signatures over byte trigrams, computed for all texts at once
+
+    Returns (signatures, has_shingles): an (n, num_perm) uint64 array and
+    a mask of the texts long enough to have any trigram.
+    """
+    encoded = [text.encode('utf-8') for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    buffer = np.frombuffer(b'\0'.join(encoded) + b'\0\0', dtype=np.uint8).astype(np.uint64)
+
+    # Trigram code at every byte position, kept only where the trigram lies inside one text
+    codes = (buffer[:-2] << np.uint64(16)) | (buffer[1:-1] << np.uint64(8)) | buffer[2:]
+    starts = np.cumsum(lengths + 1) - (lengths + 1)
+    shingle_counts = np.maximum(lengths - 2, 0)
+    positions = np.repeat(starts, shingle_counts) + (
+        np.arange(shingle_counts.sum()) - np.repeat(np.cumsum(shingle_counts) - shingle_counts, shingle_counts))
+    codes = codes[positions]
+
+    has_shingles = shingle_counts > 0
+    offsets = (np.cumsum(shingle_counts) - shingle_counts)[has_shingles]
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    signatures = np.full((len(texts), num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+    if len(codes):
+        for i in range(num_perm):
+            hashed = (a[i] * codes + b[i]) % np.uint64(MERSENNE_PRIME)
+            signatures[has_shingles, i] = np.minimum.reduceat(hashed, offsets)
+    return signatures, has_shingles
+
+
+def find_duplicate_clusters(jobs, threshold=ROLE_SIMILARITY, bands=LSH_BANDS, rows=LSH_ROWS):
+    """Group job dicts that describe the same posting; returns lists of indices
+
+    Postings match when they share an apply link, or when their
+    normalized companies are equal, their locations are compatible and
+    their normalized roles are similar.
+    Exact keys are grouped with a dict, near matches are found by MinHash
+    LSH over role trigrams (bucketed per company) and confirmed exactly,
+    so the work grows with the number of candidates, not n squared.
+    """
+    n = len(jobs)
+    companies = [normalize_company(job.get('Company')) for job in jobs]
+    roles = [normalize_role(job.get('Role')) for job in jobs]
+    locations = [normalize_location(job.get('Location')) for job in jobs]
+    clusters = UnionFind(n)
+
+    # The same apply link is always the same posting
+    first_by_link = {}
+    for i, job in enumerate(jobs):
+        if not is_placeholder(job.get('Apply Link')):
+            clusters.union(first_by_link.setdefault(normalize_link(job['Apply Link']), i), i)
+
+    # Exact normalized keys
+    first_by_key = {}
+    for i, key in enumerate(zip(companies, roles, locations)):
+        if key[0]:
+            clusters.union(first_by_key.setdefault(key, i), i)
+
+    # Near matches: one job per exact key, bucketed by company and one LSH band of its role signature
+    representatives = np.fromiter(sorted(first_by_key.values()), dtype=np.int64, count=len(first_by_key))
+    company_ids = np.unique([companies[i] for i in representatives], return_inverse=True)[1].astype(np.uint64)
+    signatures, has_shingles = minhash_signatures([f' {roles[i]} ' for i in representatives], bands * rows)
+    candidates = representatives[has_shingles]
+    company_ids = company_ids[has_shingles]
+    signatures = signatures[has_shingles]
+
+    for band in range(bands):
+        band_hash = company_ids * np.uint64(0x9E3779B97F4A7C15)
+        for column in signatures[:, band * rows:(band + 1) * rows].T:
+            band_hash = band_hash * np.uint64(1000003) ^ column
+        order = np.argsort(band_hash, kind='stable')
+        # Runs of two or more equal band hashes are candidate groups
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(band_hash[order])) + 1, [len(order)]])
+        shared = np.diff(bounds) > 1
+        for start, stop in zip(bounds[:-1][shared], bounds[1:][shared]):
+            group = candidates[order[start:stop]]
+            anchor = group[0]
+            for other in group[1:]:
+                if (companies[anchor] == companies[other]
+                        and locations_compatible(locations[anchor], locations[other])
+                        and clusters.find(anchor) != clusters.find(other)
+                        and roles_match(roles[anchor], roles[other], threshold)):
+                    clusters.union(anchor, other)
+
+    grouped = {}
+    for i in range(n):
+        grouped.setdefault(clusters.find(i), []).append(i)
+    return list(grouped.values())
+
+
+def merge_records(records):
+    """Canonical record of a duplicate cluster
+
+    The record with the most real (non-placeholder) fields is kept, with
+    its apply link, email and source. Descriptive fields take the longest
+    real value found in the cluster, and 'Keywords' lists are combined.
+    """
+    canonical = max(records, key=lambda record: sum(not is_placeholder(value) for value in record.values()))
+    merged = dict(canonical)
+    for field in ('Company', 'Role', 'Location', 'Stipend (₹/month)'):
+        values = [record.get(field) for record in records if not is_placeholder(record.get(field))]
+        if values:
+            merged[field] = max(values, key=lambda value: len(str(value)))
+    # Searches that found any copy of the posting
+    keywords = {keyword for record in records for keyword in record.get('Keywords') or ()}
+    if keywords:
+        merged['Keywords'] = sorted(keywords)
+    return merged
+
+
+def dedupe_jobs(jobs, threshold=ROLE_SIMILARITY):
+    """Jobs with near-duplicate postings merged, in first-seen order"""
+    return [merge_records([jobs[i] for i in cluster]) if len(cluster) > 1 else jobs[cluster[0]]
+            for cluster in find_duplicate_clusters(jobs, threshold)]
@@ -0,0 +1,93 @@
+import base64
+import os
+import re
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formataddr
+from string import Template
+
+from dedup import is_placeholder
+
+APPLICANT_NAME = os.getenv('APPLICANT_NAME', 'Prakhar Gupta')
+
+# Compiled once at import; rendering a message is a single substitute() per field
+SUBJECT_TEMPLATE = Template("Application for $role at $company")
+BODY_TEMPLATE = Template("""Dear Hiring Team at $company,
+
+I came across the $role opening ($location) and would like to apply for it.
+
+Please find my resume attached. I would be glad to discuss how I can contribute to your team.
+
+Job posting: $apply_link
+
+Thank you for your consideration.
+
+Best regards,
+$name
+""")
+
+# Job dict field -> template placeholder, with the text used when the field is missing
+TEMPLATE_FIELDS = {
+    'Company': ('company', 'your company'),
+    'Role': ('role', 'open'),
+    'Location': ('location', 'location not specified'),
+    'Apply Link': ('apply_link', 'not listed'),
+}
+
+EMAIL_PATTERN = re.compile(r'^[^@\s,;<>]+@[^@\s,;<>]+\.[^@\s,;<>]+$')
+
+
+def is_valid_email(address):
+    return not is_placeholder(address) and bool(EMAIL_PATTERN.match(str(address).strip()))
+
+
+class ResumeAttachment:
+    """Resume encoded to base64 once and attached to any number of messages
+
+    Each message gets its own small MIME part, but they all share the one
+    pre-encoded payload string, so the PDF is never re-encoded.
+    """
+
+    def __init__(self, data, filename):
+        self.filename = filename
+        self.payload = base64.encodebytes(bytes(data)).decode('ascii')
+
+    def part(self):
+        part = MIMEBase('application', 'octet-stream')
+        part.set_payload(self.payload)
+        part['Content-Transfer-Encoding'] = 'base64'
+        part.add_header('Content-Disposition', f'attachment; filename="{self.filename}"')
+        return part
+
+
+def template_context(job, name=APPLICANT_NAME):
+    context = {'name': name}
+    for field, (placeholder, fallback) in TEMPLATE_FIELDS.items():
+        value = job.get(field)
+        context[placeholder] = fallback if is_placeholder(value) else str(value).strip()
+    return context
+
+
+def build_application(job, resume, sender, name=APPLICANT_NAME):
+    """Personalized application email for one job, sent to its EmailID"""
+    context = template_context(job, name)
+    msg = MIMEMultipart()
+    msg['From'] = formataddr((name, sender))
+    msg['To'] = str(job['EmailID']).strip()
+    msg['Subject'] = SUBJECT_TEMPLATE.safe_substitute(context)
+    msg.attach(MIMEText(BODY_TEMPLATE.safe_substitute(context), 'plain'))
+    if resume is not None:
+        msg.attach(resume.part())
+    return msg
+
+
+def build_applications(jobs, resume, sender, name=APPLICANT_NAME):
+    """(messages, skipped): one application per job with a usable EmailID, and the jobs without one"""
+    messages, skipped = [], []
+    for job in jobs:
+        if is_valid_email(job.get('EmailID')):
+            messages.append(build_application(job, resume, sender, name))
+        else:
+            skipped.append(job)
+    return messages, skipped
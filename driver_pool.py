@@ -0,0 +1,202 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+try:
+    import psutil
+except ImportError:  # Memory-based recycling is skipped without psutil
+    psutil = None
+
+
+# Resources a lean driver never downloads: images, fonts, stylesheets and trackers
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.css',
+    '*googletagmanager.com*', '*google-analytics.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*facebook.net*', '*hotjar.com*', '*clarity.ms*',
+    '*moengage.com*', '*amplitude.com*', '*branch.io*',
+]
+
+
+def build_chrome_options(lean=True):
+    """Chrome options used for every scraping driver
+
+    The lean profile returns control as soon as the DOM is ready (eager
+    page-load strategy) and disables images, so callers rely on
+    WebDriverWait conditions rather than full page loads.
+    """
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')  # Run in background
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    if lean:
+        chrome_options.page_load_strategy = 'eager'
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.managed_default_content_settings.fonts': 2,
+        })
+    return chrome_options
+
+
+def create_driver(lean=True):
+    """Launch a new headless Chrome WebDriver"""
+    driver = webdriver.Chrome(options=build_chrome_options(lean))
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    if lean:
+        # Block stylesheets, fonts and trackers at the network layer
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    return driver
+
+
+def driver_rss_bytes(driver):
+    """Resident memory of the Chrome processes behind a driver, or None if unknown"""
+    if psutil is None:
+        return None
+    try:
+        service_process = psutil.Process(driver.service.process.pid)
+        processes = [service_process] + service_process.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes if p.is_running())
+    except Exception:
+        return None
+
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+
+
+class DriverPool:
+    """Long-lived, size-bounded pool of warm headless Chrome drivers
+
+    Drivers are checked out for the duration of a scrape and checked back
+    in afterwards instead of being quit, so later scrapes (and other
+    Streamlit sessions) skip Chrome's cold start. Idle drivers are health
+    checked before reuse, and a driver is recycled once it has served
+    `max_pages` pages or its Chrome processes grow past `max_rss_mb`.
+    """
+
+    def __init__(self, max_size=2, max_pages=50, max_rss_mb=1024, lean=True, driver_factory=None):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.driver_factory = driver_factory or partial(create_driver, lean=lean)
+        self.idle = []
+        self.total = 0  # Idle plus checked-out drivers
+        self.condition = threading.Condition()
+
+    def is_healthy(self, pooled):
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def needs_recycle(self, pooled):
+        if pooled.pages >= self.max_pages:
+            return True
+        rss = driver_rss_bytes(pooled.driver)
+        return rss is not None and rss > self.max_rss_bytes
+
+    def discard(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        with self.condition:
+            self.total -= 1
+            self.condition.notify()
+
+    def checkout(self, timeout=300):
+        """Take a healthy driver from the pool, launching one if below max_size"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.condition:
+                while not self.idle and self.total >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("No WebDriver available in the pool")
+                    self.condition.wait(remaining)
+                if self.idle:
+                    pooled = self.idle.pop()
+                else:
+                    self.total += 1
+                    pooled = None
+
+            if pooled is None:
+                try:
+                    return PooledDriver(self.driver_factory())
+                except Exception:
+                    with self.condition:
+                        self.total -= 1
+                        self.condition.notify()
+                    raise
+
+            if self.is_healthy(pooled):
+                return pooled
+            print("Discarding unhealthy WebDriver from pool")
+            self.discard(pooled)
+
+    def checkin(self, pooled):
+        """Return a driver to the pool, recycling it if it is worn out or broken"""
+        if not self.is_healthy(pooled) or self.needs_recycle(pooled):
+            self.discard(pooled)
+            return
+        with self.condition:
+            self.idle.append(pooled)
+            self.condition.notify()
+
+    @contextmanager
+    def session(self, timeout=300):
+        """Check out a driver for the duration of a with-block"""
+        pooled = self.checkout(timeout)
+        try:
+            yield pooled
+        finally:
+            self.checkin(pooled)
+
+    def warm(self, count=1):
+        """Make sure at least `count` drivers have been launched"""
+        launched = []
+        try:
+            while True:
+                with self.condition:
+                    if self.total >= min(count, self.max_size):
+                        break
+                launched.append(self.checkout())
+        finally:
+            for pooled in launched:
+                self.checkin(pooled)
+
+    def shutdown(self):
+        """Quit every idle driver"""
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for pooled in idle:
+            self.discard(pooled)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Return the process-wide DriverPool shared by every JobScraper"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -0,0 +1,78 @@
+import re
+from urllib.parse import urljoin
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:  # Fall back to the slower pure-Python parser
+    HTML_PARSER = 'html.parser'
+
+
+def clean_text(text):
+    """Clean and normalize text data"""
+    if not text:
+        return ""
+    return re.sub(r'\s+', ' ', text.strip())
+
+
+class FieldSpec:
+    """Ordered fallback CSS selectors for one field, compiled once
+
+    The first selector that matches an element wins. With `attr` the
+    field is that attribute of the element (joined onto the source's
+    base URL for links), otherwise it is the element's cleaned text.
+    """
+
+    def __init__(self, *selectors, attr=None):
+        self.selectors = [soupsieve.compile(selector) for selector in selectors]
+        self.attr = attr
+
+    def extract(self, card, base_url):
+        for selector in self.selectors:
+            elem = selector.select_one(card)
+            if elem is None:
+                continue
+            if self.attr is None:
+                return clean_text(elem.get_text())
+            value = elem.get(self.attr)
+            if not value:
+                return ""
+            return urljoin(base_url, value) if self.attr == 'href' else value
+        return ""
+
+
+class SourceSpec:
+    """Declarative description of one job portal's listing pages
+
+    `url_template` is formatted with `keywords` and `page`, `cards` lists
+    fallback selectors for the job cards (the first selector that finds
+    any card is used) and `fields` maps output fields to FieldSpecs.
+    """
+
+    def __init__(self, name, base_url, url_template, cards, fields):
+        self.name = name
+        self.base_url = base_url
+        self.url_template = url_template
+        self.cards = [soupsieve.compile(selector) for selector in cards]
+        self.fields = fields
+
+    def page_url(self, keywords, page=1):
+        return self.url_template.format(keywords=keywords, page=page)
+
+    def find_cards(self, soup):
+        for selector in self.cards:
+            cards = selector.select(soup)
+            if cards:
+                return cards
+        return []
+
+    def extract(self, html):
+        """Parse a listing page and return one dict of raw field values per card"""
+        soup = BeautifulSoup(html, HTML_PARSER)
+        return [
+            {field: spec.extract(card, self.base_url) for field, spec in self.fields.items()}
+            for card in self.find_cards(soup)
+        ]
@@ -0,0 +1,136 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', '.http_cache')
+HTTP_CACHE_TTL = float(os.getenv('HTTP_CACHE_TTL', 6 * 60 * 60))  # Seconds
+HTTP_CACHE_MAX_BYTES = int(float(os.getenv('HTTP_CACHE_MAX_MB', 200)) * 1024 * 1024)
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response served from the cache"""
+
+    def __init__(self, url, status_code, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.from_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+
+class CacheEntry:
+    def __init__(self, url, status_code, headers, content, etag, last_modified, stored_at):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+    def is_fresh(self, ttl):
+        return time.time() - self.stored_at < ttl
+
+    def validators(self):
+        """Conditional request headers for revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self):
+        return CachedResponse(self.url, self.status_code, self.headers, self.content)
+
+
+class ResponseCache:
+    """On-disk HTTP response cache keyed by URL
+
+    Entries live in a SQLite file, expire after `ttl` seconds and are
+    revalidated with ETag/Last-Modified when the server provides them.
+    The least recently used entries are evicted once the stored bodies
+    exceed `max_bytes`.
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, ttl=HTTP_CACHE_TTL, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'responses.db'), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status_code INTEGER,
+                headers TEXT,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self.conn.commit()
+
+    def lookup(self, url):
+        """Return the CacheEntry for a URL (fresh or stale), or None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT status_code, headers, body, etag, last_modified, stored_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+        status_code, headers, body, etag, last_modified, stored_at = row
+        return CacheEntry(url, status_code, json.loads(headers), body, etag, last_modified, stored_at)
+
+    def store(self, url, response):
+        """Save a successful response and evict old entries if over budget"""
+        body = response.content
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, response.status_code, json.dumps(dict(response.headers)), body,
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now, len(body))
+            )
+            self.evict()
+            self.conn.commit()
+
+    def revalidated(self, url):
+        """Mark an entry fresh again after a 304 Not Modified"""
+        with self.lock:
+            now = time.time()
+            self.conn.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+            self.conn.commit()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes (lock held)"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall()
+        stale = []
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((url,))
+            total -= size
+        self.conn.executemany("DELETE FROM responses WHERE url = ?", stale)
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import ResponseCache
+from rate_limit import RateLimiter, parse_retry_after
+
+
+class HttpEngine:
+    """Shared fetch layer for the requests-based scrapers
+
+    Keeps one pooled keep-alive session for every source, caps how many
+    requests may hit the same host at once and applies a default timeout
+    to every request. Pages are fetched on a worker pool so several pages
+    of one portal can be in flight together, paced per host by an
+    adaptive rate limiter. Successful responses go to an on-disk cache so
+    repeat searches inside its TTL skip the network entirely.
+    """
+
+    def __init__(self, pool_size=20, per_host_limit=4, timeout=(5, 20), max_workers=16, limiter=None, cache=None):
+        self.timeout = timeout
+        self.limiter = limiter or RateLimiter()
+        self.cache = cache or ResponseCache()
+        self.per_host_limit = per_host_limit
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http")
+        self.host_slots = {}
+        self.host_slots_lock = threading.Lock()
+
+    def get_host_slot(self, url):
+        """Return the semaphore limiting concurrent requests to the URL's host"""
+        host = urlparse(url).netloc.lower()
+        with self.host_slots_lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self.host_slots[host]
+
+    def get(self, url, headers=None, timeout=None, use_cache=True):
+        """Blocking GET, served from the response cache when a fresh copy exists
+
+        use_cache=False bypasses cache lookups and always hits the network,
+        but the fresh response is still stored for later requests.
+        """
+        entry = self.cache.lookup(url) if use_cache else None
+        if entry and entry.is_fresh(self.cache.ttl):
+            return entry.to_response()
+
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(entry.validators())
+
+        response = self.fetch(url, request_headers, timeout)
+
+        if response.status_code == 304 and entry:
+            self.cache.revalidated(url)
+            return entry.to_response()
+        if response.status_code == 200:
+            self.cache.store(url, response)
+        return response
+
+    def fetch(self, url, headers=None, timeout=None):
+        """GET over the network, respecting the per-host cap and rate limit"""
+        self.limiter.acquire(url)
+        with self.get_host_slot(url):
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+            except Exception:
+                self.limiter.record(url, None, time.perf_counter() - start)
+                raise
+            self.limiter.record(url, response.status_code, time.perf_counter() - start,
+                                parse_retry_after(response.headers.get('Retry-After')))
+            return response
+
+    def submit(self, url, headers=None, timeout=None, use_cache=True):
+        """Schedule a GET on the worker pool and return its Future"""
+        return self.executor.submit(self.get, url, headers, timeout, use_cache)
+
+    def fetch_iter(self, urls, headers=None, window=None, use_cache=True):
+        """Yield (url, future) pairs in order while keeping up to `window` pages in flight
+
+        Stopping the iteration early cancels the pages that have not
+        started yet, so a scraper that has reached its target does not
+        download the rest of the listing.
+        """
+        window = window or self.per_host_limit
+        pending = deque()
+        urls = iter(urls)
+
+        def fill():
+            while len(pending) < window:
+                url = next(urls, None)
+                if url is None:
+                    return
+                pending.append((url, self.submit(url, headers, use_cache=use_cache)))
+
+        try:
+            fill()
+            while pending:
+                url, future = pending.popleft()
+                yield url, future
+                fill()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Return the process-wide HttpEngine shared by all scrapers"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = HttpEngine()
+        return _engine
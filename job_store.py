@@ -0,0 +1,252 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+JOB_STORE_PATH = os.getenv('JOB_STORE_PATH', os.path.join('.cache', 'jobs.db'))
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = frozenset(['ref', 'refid', 'trackingid', 'trk', 'position', 'pagenum', 'src'])
+
+# Job dict field -> jobs table column
+JOB_COLUMNS = {
+    'Company': 'company',
+    'Role': 'role',
+    'Location': 'location',
+    'Stipend (₹/month)': 'stipend',
+    'Apply Link': 'apply_link',
+    'EmailID': 'email',
+    'Source': 'source',
+}
+
+
+def normalize_link(url):
+    """Canonical form of an apply link: lowercase host, no fragment, tracking params or trailing slash"""
+    parts = urlsplit(str(url).strip())
+    query = [
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith('utm_') and name.lower() not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ''))
+
+
+def link_key(url):
+    """Stable id of an apply link, equal for links that only differ in tracking noise"""
+    return hashlib.sha1(normalize_link(url).encode('utf-8')).hexdigest()
+
+
+def job_key(job):
+    """Stable id of a job, derived from its normalized apply link"""
+    return link_key(job.get('Apply Link', ''))
+
+
+def normalize_keyword(keyword):
+    return ' '.join(str(keyword).lower().split())
+
+
+class JobStore:
+    """Persistent, indexed store of scraped jobs in SQLite
+
+    Jobs are upserted by job_key, keeping the time they were first seen
+    and refreshing the last-seen time and fields on every sighting. The
+    keywords a job was found under live in a separate table, so one job
+    can belong to several searches. Queries by keyword, company, location
+    and last-seen date are served from indexes.
+    """
+
+    def __init__(self, path=JOB_STORE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_key TEXT PRIMARY KEY,
+                    company TEXT,
+                    role TEXT,
+                    location TEXT,
+                    stipend TEXT,
+                    apply_link TEXT,
+                    email TEXT,
+                    source TEXT,
+                    first_seen REAL,
+                    last_seen REAL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_keywords (
+                    job_key TEXT,
+                    keyword TEXT,
+                    first_seen REAL,
+                    last_seen REAL,
+                    PRIMARY KEY (job_key, keyword)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS seen_listings (
+                    source TEXT,
+                    keyword TEXT,
+                    job_key TEXT,
+                    content_hash TEXT,
+                    last_seen REAL,
+                    PRIMARY KEY (source, keyword, job_key)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_job_keywords_keyword ON job_keywords (keyword, last_seen)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company COLLATE NOCASE)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_location ON jobs (location COLLATE NOCASE)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs (last_seen)")
+
+    @contextmanager
+    def connect(self):
+        """Short-lived connection committed on success, so any thread or process can use the store"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def upsert(self, jobs, keyword=None, seen_at=None):
+        """Insert or refresh jobs (dicts with the CSV field names); returns how many were new
+        
+        Jobs are linked to `keyword`, or to every search in their own
+        'Keywords' list when they carry one.
+        """
+        now = seen_at or time.time()
+        rows = {}
+        tags = set()
+        for job in jobs:
+            for job_keyword in job.get('Keywords') or ([keyword] if keyword else []):
+                tags.add((job_key(job), normalize_keyword(job_keyword)))
+            values = [job.get(field) for field in JOB_COLUMNS]
+            # None and NaN (from DataFrame records) are stored as NULL
+            rows[job_key(job)] = [None if value is None or value != value else str(value) for value in values]
+        if not rows:
+            return 0
+
+        keys = list(rows)
+        with self.lock, self.connect() as conn:
+            existing = set()
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                existing.update(row[0] for row in conn.execute(
+                    f"SELECT job_key FROM jobs WHERE job_key IN ({placeholders})", chunk))
+
+            conn.executemany("""
+                INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_key) DO UPDATE SET
+                    company = excluded.company,
+                    role = excluded.role,
+                    location = excluded.location,
+                    stipend = excluded.stipend,
+                    apply_link = excluded.apply_link,
+                    email = excluded.email,
+                    source = COALESCE(excluded.source, jobs.source),
+                    last_seen = excluded.last_seen
+            """, [(key, *values, now, now) for key, values in rows.items()])
+
+            conn.executemany("""
+                INSERT INTO job_keywords VALUES (?, ?, ?, ?)
+                ON CONFLICT(job_key, keyword) DO UPDATE SET last_seen = excluded.last_seen
+            """, [(key, job_keyword, now, now) for key, job_keyword in tags])
+        return len(keys) - len(existing)
+
+    def seen_listings(self, source, keyword):
+        """{job_key: content_hash} of every listing a source has shown for a keyword"""
+        with self.connect() as conn:
+            return dict(conn.execute(
+                "SELECT job_key, content_hash FROM seen_listings WHERE source = ? AND keyword = ?",
+                (source, normalize_keyword(keyword))))
+
+    def mark_seen(self, source, keyword, listings, seen_at=None):
+        """Record (job_key, content_hash) sightings and refresh the last-seen time of those jobs"""
+        now = seen_at or time.time()
+        keyword = normalize_keyword(keyword)
+        listings = list(listings)
+        if not listings:
+            return
+        with self.lock, self.connect() as conn:
+            conn.executemany("""
+                INSERT INTO seen_listings VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(source, keyword, job_key) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    last_seen = excluded.last_seen
+            """, [(source, keyword, key, content_hash, now) for key, content_hash in listings])
+            # Unchanged listings are not upserted again, so keep their stored jobs current here
+            conn.executemany("UPDATE jobs SET last_seen = ? WHERE job_key = ?", [(now, key) for key, _ in listings])
+            conn.executemany("UPDATE job_keywords SET last_seen = ? WHERE job_key = ? AND keyword = ?",
+                             [(now, key, keyword) for key, _ in listings])
+
+    def query(self, keyword=None, company=None, location=None, since=None, limit=None):
+        """Jobs matching every given filter, most recently seen first
+
+        company and location match case-insensitively by prefix (so their
+        NOCASE indexes apply); since is a Unix timestamp compared against
+        the last sighting (under the keyword, when one is given).
+        """
+        sql = ["SELECT jobs.*, {} AS seen_at FROM jobs".format('job_keywords.last_seen' if keyword else 'jobs.last_seen')]
+        where, params = [], []
+        if keyword:
+            sql.append("JOIN job_keywords ON job_keywords.job_key = jobs.job_key")
+            where.append("job_keywords.keyword = ?")
+            params.append(normalize_keyword(keyword))
+            if since is not None:
+                where.append("job_keywords.last_seen >= ?")
+                params.append(since)
+        elif since is not None:
+            where.append("jobs.last_seen >= ?")
+            params.append(since)
+        if company:
+            where.append("jobs.company LIKE ?")
+            params.append(f"{company}%")
+        if location:
+            where.append("jobs.location LIKE ?")
+            params.append(f"{location}%")
+        if where:
+            sql.append("WHERE " + " AND ".join(where))
+        sql.append("ORDER BY seen_at DESC")
+        if limit:
+            sql.append("LIMIT ?")
+            params.append(int(limit))
+
+        with self.connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(" ".join(sql), params).fetchall()
+        return [self.row_to_job(row) for row in rows]
+
+    def recent(self, keyword, days=7):
+        """Jobs seen under a keyword in the last `days` days"""
+        return self.query(keyword=keyword, since=time.time() - days * 24 * 60 * 60)
+
+    @staticmethod
+    def row_to_job(row):
+        job = {field: row[column] for field, column in JOB_COLUMNS.items()}
+        job['First Seen'] = row['first_seen']
+        job['Last Seen'] = row['last_seen']
+        return job
+
+    def count(self):
+        with self.connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_job_store():
+    """Process-wide JobStore (the SQLite file itself is shared across processes)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobStore()
+        return _store
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', os.path.join('.cache', 'llm_cache.db'))
+LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', 7 * 24 * 60 * 60))  # Seconds
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 5000))
+
+
+class LLMCache:
+    """Persistent cache of LLM completions keyed by a content hash
+
+    The key covers the input text, model, prompt version and temperature,
+    so editing a prompt (and bumping its version) or switching models
+    never serves a stale answer. Entries live in SQLite, which makes the
+    cache shared between Streamlit sessions and worker processes. Entries
+    expire after `ttl` seconds and the least recently used are evicted
+    past `max_entries`. Hit/miss counters are stored alongside.
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS completions (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT,
+                    value TEXT,
+                    created_at REAL,
+                    accessed_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_completions_accessed ON completions (accessed_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, count INTEGER)")
+
+    @contextmanager
+    def connect(self):
+        """Short-lived connection committed on success, so any thread or process can use the cache"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(kind, text, model, prompt_version, temperature):
+        payload = json.dumps([kind, model, prompt_version, temperature, text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def count(self, conn, name):
+        conn.execute("INSERT INTO stats VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET count = count + 1", (name,))
+
+    def get(self, key):
+        """Return the cached completion for a key, or None if missing or expired"""
+        now = time.time()
+        with self.lock, self.connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] >= self.ttl:
+                self.count(conn, 'misses')
+                return None
+            conn.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+            self.count(conn, 'hits')
+            return row[0]
+
+    def put(self, key, kind, value):
+        now = time.time()
+        with self.lock, self.connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?)", (key, kind, value, now, now))
+            conn.execute("DELETE FROM completions WHERE created_at < ?", (now - self.ttl,))
+            conn.execute("""
+                DELETE FROM completions WHERE key IN (
+                    SELECT key FROM completions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def get_or_compute(self, kind, text, model, prompt_version, temperature, compute):
+        """Return the cached completion, calling compute() and storing its result on a miss
+
+        Exceptions from compute() propagate and nothing is cached.
+        """
+        key = self.make_key(kind, text, model, prompt_version, temperature)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, kind, value)
+        return value
+
+    def stats(self):
+        with self.connect() as conn:
+            counts = dict(conn.execute("SELECT name, count FROM stats").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        return {'hits': counts.get('hits', 0), 'misses': counts.get('misses', 0), 'entries': entries}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Process-wide LLMCache (the SQLite file itself is shared across processes)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
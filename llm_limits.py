@@ -0,0 +1,96 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Groq quotas for llama3-70b-8192; override to match your account tier
+GROQ_RPM = int(os.getenv('GROQ_RPM', 30))
+GROQ_TPM = int(os.getenv('GROQ_TPM', 6000))
+# Groq calls allowed in flight at once across all sessions
+GROQ_MAX_WORKERS = int(os.getenv('GROQ_MAX_WORKERS', 8))
+
+
+class GroqRateLimiter:
+    """Sliding one-minute window over requests and tokens per minute
+
+    acquire() blocks until sending one more request with the given token
+    estimate keeps both the request and the token count of the last 60
+    seconds under the configured limits.
+    """
+
+    def __init__(self, rpm=GROQ_RPM, tpm=GROQ_TPM):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = deque()  # (timestamp, tokens)
+        self.tokens_in_window = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens):
+        tokens = min(tokens, self.tpm)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.window and now - self.window[0][0] >= 60:
+                    self.tokens_in_window -= self.window.popleft()[1]
+
+                if len(self.window) < self.rpm and self.tokens_in_window + tokens <= self.tpm:
+                    self.window.append((now, tokens))
+                    self.tokens_in_window += tokens
+                    return
+                delay = 60 - (now - self.window[0][0])
+            time.sleep(max(delay, 0.05))
+
+
+def estimate_tokens(*texts, completion_tokens=0):
+    """Rough token count for a prompt (about four characters per token)"""
+    return sum(len(text) for text in texts) // 4 + completion_tokens
+
+
+def is_rate_limit_error(error):
+    return getattr(error, 'status_code', None) == 429 or 'rate limit' in str(error).lower()
+
+
+def retry_after_seconds(error):
+    response = getattr(error, 'response', None)
+    try:
+        return float(response.headers.get('retry-after'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def call_with_retry(func, limiter, tokens, max_retries=4, base_delay=2.0):
+    """Call func() under the rate limiter, retrying 429s with exponential backoff and jitter"""
+    for attempt in range(max_retries + 1):
+        limiter.acquire(tokens)
+        try:
+            return func()
+        except Exception as e:
+            if attempt == max_retries or not is_rate_limit_error(e):
+                raise
+            delay = retry_after_seconds(e) or base_delay * (2 ** attempt)
+            time.sleep(delay + random.uniform(0, base_delay))
+
+
+_limiter = None
+_executor = None
+_shared_lock = threading.Lock()
+
+
+def get_groq_limiter():
+    """Process-wide limiter shared by every Streamlit session"""
+    global _limiter
+    with _shared_lock:
+        if _limiter is None:
+            _limiter = GroqRateLimiter()
+        return _limiter
+
+
+def get_llm_executor():
+    """Process-wide worker pool for Groq calls, capped at GROQ_MAX_WORKERS"""
+    global _executor
+    with _shared_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=GROQ_MAX_WORKERS, thread_name_prefix="groq")
+        return _executor
@@ -0,0 +1,349 @@
+import atexit
+import os
+import queue
+import random
+import smtplib
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from email.utils import getaddresses
+
+SMTP_HOST = os.getenv('SMTP_HOST', 'smtp.gmail.com')
+SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
+# Set to 0 for servers without TLS, such as a local aiosmtpd stand-in
+SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', '1') == '1'
+SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', 2))
+SMTP_TIMEOUT = float(os.getenv('SMTP_TIMEOUT', 30))
+# Gmail drops a connection after about 100 messages, so reconnect before that
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv('SMTP_MAX_MESSAGES_PER_CONNECTION', 90))
+SMTP_MAX_RETRIES = int(os.getenv('SMTP_MAX_RETRIES', 3))
+SMTP_RETRY_BACKOFF = float(os.getenv('SMTP_RETRY_BACKOFF', 2.0))
+# Connections idle longer than this get a NOOP before reuse
+SMTP_IDLE_CHECK_SECONDS = 30
+# Finished send jobs kept for status polling
+MAIL_JOB_HISTORY = 1000
+
+
+def is_transient(error):
+    """Whether a send error is worth retrying (dropped connection, timeout or 4xx reply)"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    # Other SMTPExceptions (e.g. no AUTH support) are also OSErrors but will not go away
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+def recipients(message):
+    return [address for _, address in getaddresses(message.get_all('To', []) + message.get_all('Cc', []))]
+
+
+class PooledConnection:
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+    def send(self, message):
+        self.smtp.send_message(message)
+        self.messages += 1
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """Size-bounded pool of connected, authenticated SMTP sessions
+
+    Connections stay open between sends, so STARTTLS and login are paid
+    once per connection rather than once per message. Connections idle
+    for a while are checked with NOOP before reuse, and a connection is
+    closed once it has sent `max_messages` messages.
+    """
+
+    def __init__(self, host=SMTP_HOST, port=SMTP_PORT, username=None, password=None, starttls=SMTP_STARTTLS,
+                 max_size=SMTP_POOL_SIZE, max_messages=SMTP_MAX_MESSAGES_PER_CONNECTION, timeout=SMTP_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.max_size = max_size
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self.idle = []
+        self.total = 0  # Idle plus checked-out connections
+        self.condition = threading.Condition()
+
+    def connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                smtp.starttls()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        return PooledConnection(smtp)
+
+    def is_healthy(self, pooled):
+        if time.monotonic() - pooled.last_used < SMTP_IDLE_CHECK_SECONDS:
+            return True
+        try:
+            return pooled.smtp.noop()[0] == 250
+        except Exception:
+            return False
+
+    def discard(self, pooled):
+        try:
+            pooled.smtp.quit()
+        except Exception:
+            pooled.smtp.close()
+        with self.condition:
+            self.total -= 1
+            self.condition.notify()
+
+    def checkout(self, timeout=300):
+        """Take a live connection from the pool, opening one if below max_size"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.condition:
+                while not self.idle and self.total >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("No SMTP connection available in the pool")
+                    self.condition.wait(remaining)
+                if self.idle:
+                    pooled = self.idle.pop()
+                else:
+                    self.total += 1
+                    pooled = None
+
+            if pooled is None:
+                try:
+                    return self.connect()
+                except Exception:
+                    with self.condition:
+                        self.total -= 1
+                        self.condition.notify()
+                    raise
+
+            if self.is_healthy(pooled):
+                return pooled
+            self.discard(pooled)
+
+    def checkin(self, pooled):
+        if pooled.messages >= self.max_messages:
+            self.discard(pooled)
+            return
+        with self.condition:
+            self.idle.append(pooled)
+            self.condition.notify()
+
+    @contextmanager
+    def session(self, timeout=300):
+        """Check out a connection for a with-block; it is dropped if the block raises"""
+        pooled = self.checkout(timeout)
+        try:
+            yield pooled
+        except Exception:
+            self.discard(pooled)
+            raise
+        self.checkin(pooled)
+
+    def shutdown(self):
+        """QUIT every idle connection"""
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for pooled in idle:
+            self.discard(pooled)
+
+
+class MailJob:
+    """Progress of one submitted group of messages"""
+
+    def __init__(self, total, on_result=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.total = total
+        self.on_result = on_result
+        self.sent = 0
+        self.errors = []
+        self.started = False
+        self.created_at = time.time()
+        self.finished_at = None
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        if not total:
+            self.finish()
+
+    def record(self, message, error=None):
+        if self.on_result is not None:
+            try:
+                self.on_result(message, error)
+            except Exception as e:
+                print(f"Mail result callback failed: {e}")
+        with self.lock:
+            if error is None:
+                self.sent += 1
+            else:
+                self.errors.append(f"{', '.join(recipients(message))}: {error}")
+            if self.sent + len(self.errors) >= self.total:
+                self.finish()
+
+    def finish(self):
+        self.finished_at = time.time()
+        self.done.set()
+
+    @property
+    def status(self):
+        if not self.done.is_set():
+            return 'sending' if self.started else 'queued'
+        if not self.errors:
+            return 'sent'
+        return 'partial' if self.sent else 'failed'
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'id': self.id,
+                'status': self.status,
+                'total': self.total,
+                'sent': self.sent,
+                'failed': len(self.errors),
+                'errors': list(self.errors),
+                'created_at': self.created_at,
+                'finished_at': self.finished_at,
+            }
+
+
+class Mailer:
+    """Background SMTP sender over a connection pool
+
+    submit() only queues the messages and returns a job id whose
+    progress can be polled with status(). Messages are batched per
+    recipient, and each batch is sent back to back over one pooled
+    connection by a worker thread. Transient failures (dropped
+    connections, timeouts, 4xx replies) are retried on a fresh connection
+    with exponential backoff; permanent ones fail only that message, or
+    the rest of the batch when connecting or logging in fails.
+    """
+
+    def __init__(self, pool, workers=None, max_retries=SMTP_MAX_RETRIES, backoff=SMTP_RETRY_BACKOFF):
+        self.pool = pool
+        self.workers = workers or pool.max_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.queue = queue.Queue()
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.threads = []
+
+    def start(self):
+        with self.lock:
+            while len(self.threads) < self.workers:
+                thread = threading.Thread(target=self.work, name=f"mailer-{len(self.threads)}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def submit(self, messages, on_result=None):
+        """Queue email.message.Message objects for sending; returns the job id
+
+        on_result(message, error) is called from a worker thread once each
+        message is sent (error None) or has finally failed.
+        """
+        messages = list(messages)
+        job = MailJob(len(messages), on_result)
+        batches = OrderedDict()
+        for message in messages:
+            key = tuple(sorted(address.lower() for address in recipients(message)))
+            batches.setdefault(key, []).append(message)
+
+        with self.lock:
+            self.jobs[job.id] = job
+            while len(self.jobs) > MAIL_JOB_HISTORY:
+                oldest = next(iter(self.jobs.values()))
+                if not oldest.done.is_set():
+                    break
+                self.jobs.popitem(last=False)
+        for batch in batches.values():
+            self.queue.put((job, batch))
+        self.start()
+        return job.id
+
+    def status(self, job_id):
+        """Snapshot dict of a job's progress, or None for an unknown id"""
+        job = self.jobs.get(job_id)
+        return job.snapshot() if job else None
+
+    def wait(self, job_id, timeout=None):
+        """Block until a job has finished; returns its status snapshot"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        job.done.wait(timeout)
+        return job.snapshot()
+
+    def work(self):
+        while True:
+            job, batch = self.queue.get()
+            try:
+                job.started = True
+                self.send_batch(job, batch)
+            except Exception as e:  # Never let a worker die
+                print(f"Mailer worker error: {e}")
+            finally:
+                self.queue.task_done()
+
+    def send_batch(self, job, batch):
+        pending = deque(batch)
+        attempts = 0
+        while pending:
+            connected = False
+            try:
+                with self.pool.session() as conn:
+                    connected = True
+                    while pending:
+                        conn.send(pending[0])
+                        attempts = 0
+                        job.record(pending.popleft())
+            except Exception as e:
+                if is_transient(e) and attempts < self.max_retries:
+                    attempts += 1
+                    delay = self.backoff * 2 ** (attempts - 1) * random.uniform(0.8, 1.2)
+                    print(f"SMTP send failed ({e}), retry {attempts}/{self.max_retries} in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                attempts = 0
+                if not connected:
+                    # Connecting or logging in again per message would fail the same way
+                    # (and repeated failed logins can get the account locked)
+                    print(f"SMTP connection failed ({e}), failing {len(pending)} queued messages")
+                    while pending:
+                        job.record(pending.popleft(), e)
+                    break
+                job.record(pending.popleft(), e)
+
+    def join(self):
+        """Block until every queued message has been handled"""
+        self.queue.join()
+
+    def shutdown(self):
+        self.pool.shutdown()
+
+
+_mailer = None
+_mailer_lock = threading.Lock()
+
+
+def get_mailer():
+    """Process-wide Mailer logged in as EMAIL_ADDRESS / EMAIL_PASSWORD"""
+    global _mailer
+    with _mailer_lock:
+        if _mailer is None:
+            pool = SMTPConnectionPool(username=os.getenv('EMAIL_ADDRESS'), password=os.getenv('EMAIL_PASSWORD'))
+            _mailer = Mailer(pool)
+            atexit.register(_mailer.shutdown)
+        return _mailer
@@ -0,0 +1,117 @@
+import itertools
+import string
+
+import numpy as np
+
+# Everything except letters, digits and + # . becomes a separator (keeps c++, c#, node.js)
+SEPARATORS = str.maketrans({
+    char: ' ' for char in map(chr, range(128))
+    if char not in string.ascii_lowercase + string.digits + '+#.'
+})
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the this to was were will with
+we you your they their not but can all any who what which when where how than then also more most such
+""".split())
+
+
+def tokenize(text):
+    """Lowercase word tokens (stopwords are dropped later through the vocabulary)"""
+    return (str(text).lower().translate(SEPARATORS) + ' ').replace('. ', ' ').split()
+
+
+def job_text(job):
+    """Text used to vectorize a SerpAPI job dict"""
+    return f"{job.get('title', '')} {job.get('title', '')} {job.get('company', '')} {job.get('description', '')}"
+
+
+class ResumeMatcher:
+    """Local TF-IDF cosine similarity between one resume and many job descriptions
+
+    The resume is tokenized once. score() vectorizes a whole batch of job
+    texts with a handful of NumPy operations over sparse (doc, term) pairs,
+    so no dense document-term matrix is ever built.
+    """
+
+    def __init__(self, resume_text):
+        # Stopwords map to -1 so they can be masked out after the vocabulary lookup
+        self.vocab = dict.fromkeys(STOPWORDS, -1)
+        resume_ids = self.lookup(tokenize(resume_text))
+        self.resume_terms = resume_ids[resume_ids >= 0]
+
+    def lookup(self, tokens):
+        """Vocabulary ids for a token sequence (-1 for stopwords), giving unseen terms the next free id"""
+        vocab = self.vocab
+        ids = []
+        for token in tokens:
+            term_id = vocab.get(token)
+            if term_id is None:
+                # Stopwords occupy entries too, so ids are unique but not contiguous
+                term_id = vocab[token] = len(vocab)
+            ids.append(term_id)
+        return np.array(ids, dtype=np.int64)
+
+    def score(self, texts):
+        """Cosine similarity (0-1) of each text to the resume"""
+        n_docs = len(texts)
+        if n_docs == 0:
+            return np.zeros(0)
+
+        docs = [tokenize(text) for text in texts]
+        lengths = np.fromiter(map(len, docs), dtype=np.int64, count=n_docs)
+        all_ids = self.lookup(itertools.chain.from_iterable(docs))
+        doc_ids = np.repeat(np.arange(n_docs, dtype=np.int64), lengths)
+        keep = all_ids >= 0
+        doc_ids = doc_ids[keep]
+
+        # Compact the vocabulary ids seen in this batch (resume included) to 0..n_terms-1
+        unique_terms, inverse = np.unique(np.concatenate([self.resume_terms, all_ids[keep]]), return_inverse=True)
+        n_terms = len(unique_terms)
+        resume_ids = inverse[:len(self.resume_terms)]
+        term_ids = inverse[len(self.resume_terms):]
+
+        # Term counts per (doc, term) pair
+        pairs, counts = np.unique(doc_ids * n_terms + term_ids, return_counts=True)
+        pair_docs = pairs // n_terms
+        pair_terms = pairs % n_terms
+
+        # Document frequency over the jobs plus the resume
+        resume_terms, resume_counts = np.unique(resume_ids, return_counts=True)
+        doc_freq = np.bincount(pair_terms, minlength=n_terms)
+        doc_freq[resume_terms] += 1
+        idf = np.log((2 + n_docs) / (1 + doc_freq)) + 1
+
+        # Sublinear tf-idf weights, L2 normalised
+        weights = (1 + np.log(counts)) * idf[pair_terms]
+        norms = np.sqrt(np.bincount(pair_docs, weights=weights ** 2, minlength=n_docs))
+
+        resume_vector = np.zeros(n_terms)
+        resume_vector[resume_terms] = (1 + np.log(resume_counts)) * idf[resume_terms]
+        resume_norm = np.linalg.norm(resume_vector)
+        if resume_norm == 0:
+            return np.zeros(n_docs)
+        resume_vector /= resume_norm
+
+        dots = np.bincount(pair_docs, weights=weights * resume_vector[pair_terms], minlength=n_docs)
+        return dots / np.where(norms > 0, norms, 1)
+
+
+def similarity_to_score(similarity):
+    """Map cosine similarity onto the 1-10 match score scale used by the UI"""
+    return np.clip(np.rint(1 + 9 * np.sqrt(similarity)), 1, 10).astype(int)
+
+
+def prefilter_jobs(jobs, resume_text, top_k):
+    """Score jobs locally and split them into the top_k candidates and the rest
+
+    Every job gets a 'similarity' and a local 'match_score'. Both lists
+    come back ordered by similarity, best first.
+    """
+    similarity = ResumeMatcher(resume_text).score([job_text(job) for job in jobs])
+    scores = similarity_to_score(similarity)
+    for job, sim, score in zip(jobs, similarity, scores):
+        job['similarity'] = float(sim)
+        job['match_score'] = int(score)
+
+    ranked = [jobs[i] for i in np.argsort(-similarity, kind='stable')]
+    return ranked[:top_k], ranked[top_k:]
@@ -0,0 +1,198 @@
+import hashlib
+import io
+import mmap
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import pypdf
+
+try:
+    import pymupdf  # Several times faster than pypdf when installed
+except ImportError:
+    pymupdf = None
+
+# 'auto' picks PyMuPDF when installed, otherwise pypdf
+PDF_BACKEND = os.getenv('PDF_BACKEND', 'auto')
+# PDFs with at least this many pages are split across worker processes
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', 8))
+PDF_MAX_WORKERS = int(os.getenv('PDF_MAX_WORKERS', min(4, os.cpu_count() or 1)))
+PDF_CACHE_MAX_ENTRIES = int(os.getenv('PDF_CACHE_MAX_ENTRIES', 64))
+
+
+def resolve_backend(backend=None):
+    backend = backend or PDF_BACKEND
+    if backend == 'auto':
+        return 'pymupdf' if pymupdf is not None else 'pypdf'
+    if backend == 'pymupdf' and pymupdf is None:
+        raise ImportError("PDF_BACKEND=pymupdf but PyMuPDF is not installed")
+    return backend
+
+
+class PdfSource:
+    """Zero-copy view over a PDF given as a path, an upload buffer or raw bytes
+
+    Paths are memory-mapped, and BytesIO-like uploads (Streamlit's
+    UploadedFile included) are read through getbuffer(), so hashing and
+    parsing work on the original memory. Use as a context manager so the
+    view and mapping are released.
+    """
+
+    def __init__(self, source):
+        self.mapping = None
+        self.file = None
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self.mapping)
+        elif hasattr(source, 'getbuffer'):
+            self.file = source
+            self.view = source.getbuffer()
+        else:
+            data = source.read() if hasattr(source, 'read') else bytes(source)
+            self.file = io.BytesIO(data)  # Shares the bytes object, no copy
+            self.view = memoryview(data)
+
+    def digest(self):
+        return hashlib.sha256(self.view).hexdigest()
+
+    def stream(self):
+        """Seekable stream over the PDF for pypdf"""
+        stream = self.mapping if self.mapping is not None else self.file
+        stream.seek(0)
+        return stream
+
+    def close(self):
+        self.view.release()
+        if self.mapping is not None:
+            self.mapping.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_document(data, backend):
+    """Open a PDF from a stream (pypdf) or bytes-like object (PyMuPDF)"""
+    if backend == 'pymupdf':
+        return pymupdf.open(stream=data, filetype='pdf')
+    return pypdf.PdfReader(data)
+
+
+def page_count(document, backend):
+    return document.page_count if backend == 'pymupdf' else len(document.pages)
+
+
+def extract_pages(document, backend, start, stop):
+    if backend == 'pymupdf':
+        return [document[i].get_text() for i in range(start, stop)]
+    return [document.pages[i].extract_text() for i in range(start, stop)]
+
+
+def extract_page_range(data, backend, start, stop):
+    """Worker-process entry point: text of pages start..stop-1"""
+    document = open_document(data if backend == 'pymupdf' else io.BytesIO(data), backend)
+    return extract_pages(document, backend, start, stop)
+
+
+class PageCache:
+    """In-memory LRU of per-page texts keyed by file hash and backend"""
+
+    def __init__(self, max_entries=PDF_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            pages = self.entries.get(key)
+            if pages is not None:
+                self.entries.move_to_end(key)
+            return pages
+
+    def put(self, key, pages):
+        with self.lock:
+            self.entries[key] = pages
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+def extract_pdf_pages(source, backend=None, parallel=None, use_cache=True):
+    """Text of every page of a PDF as a list of strings
+
+    parallel=None splits PDFs of PDF_PARALLEL_MIN_PAGES pages or more
+    across the shared process pool; True/False force either mode.
+    Results are cached by the SHA-256 of the file bytes, so Streamlit
+    reruns over the same upload never parse it again.
+    """
+    backend = resolve_backend(backend)
+    cache = get_page_cache()
+    with PdfSource(source) as pdf:
+        key = (pdf.digest(), backend)
+        if use_cache:
+            pages = cache.get(key)
+            if pages is not None:
+                return list(pages)
+
+        document = open_document(pdf.view if backend == 'pymupdf' else pdf.stream(), backend)
+        n_pages = page_count(document, backend)
+        if parallel is None:
+            parallel = n_pages >= PDF_PARALLEL_MIN_PAGES and PDF_MAX_WORKERS > 1
+
+        if parallel and n_pages > 1:
+            # One contiguous page range per worker; each worker reparses the PDF once
+            n_chunks = min(PDF_MAX_WORKERS, n_pages)
+            bounds = [n_pages * i // n_chunks for i in range(n_chunks + 1)]
+            data = bytes(pdf.view)
+            executor = get_pdf_process_pool()
+            futures = [executor.submit(extract_page_range, data, backend, start, stop)
+                       for start, stop in zip(bounds, bounds[1:])]
+            pages = [text for future in futures for text in future.result()]
+        else:
+            pages = extract_pages(document, backend, 0, n_pages)
+
+        if backend == 'pymupdf':
+            document.close()
+        del document  # The document must not outlive the buffer it reads from
+
+    if use_cache:
+        cache.put(key, tuple(pages))
+    return pages
+
+
+def extract_pdf_text(source, **kwargs):
+    """Text of a whole PDF, pages joined with spaces"""
+    return " ".join(extract_pdf_pages(source, **kwargs))
+
+
+_cache = None
+_executor = None
+_shared_lock = threading.Lock()
+
+
+def get_page_cache():
+    """Process-wide PageCache shared by every Streamlit session"""
+    global _cache
+    with _shared_lock:
+        if _cache is None:
+            _cache = PageCache()
+        return _cache
+
+
+def get_pdf_process_pool():
+    """Process-wide worker pool for page-parallel extraction
+
+    Workers are spawned rather than forked, since the Streamlit server
+    process is multi-threaded.
+    """
+    global _executor
+    with _shared_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=PDF_MAX_WORKERS,
+                                            mp_context=multiprocessing.get_context('spawn'))
+        return _executor
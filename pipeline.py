@@ -0,0 +1,225 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from pdf_extract import extract_pdf_text
+
+PIPELINE_WORKERS = int(os.getenv('PIPELINE_WORKERS', min(4, os.cpu_count() or 1)))
+# Resumes scored at once; their Groq calls still share the GROQ_MAX_WORKERS pool and rate limiter
+PIPELINE_SCORE_WORKERS = int(os.getenv('PIPELINE_SCORE_WORKERS', 4))
+PIPELINE_MATCHES = int(os.getenv('PIPELINE_MATCHES', 20))
+
+
+def collect_pdfs(paths):
+    pdfs = []
+    for path in paths:
+        if os.path.isdir(path):
+            pdfs.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.lower().endswith('.pdf'))
+        else:
+            pdfs.append(path)
+    return pdfs
+
+
+def extract_resume(path):
+    """Worker-process entry point: (path, text, error)"""
+    try:
+        return path, extract_pdf_text(path, parallel=False, use_cache=False), None
+    except Exception as e:
+        return path, "", str(e)
+
+
+def match_resume(resume_text, jobs, top_k, matches, llm_score=True):
+    """Best `matches` jobs for a resume: local TF-IDF for all, Groq re-rank for the top_k"""
+    from app import scraped_job_card, score_jobs_concurrently
+    from match_prefilter import prefilter_jobs
+    if not jobs:
+        return []
+    cards = [dict(scraped_job_card(job), record=job) for job in jobs]
+    candidates, _ = prefilter_jobs(cards, resume_text, top_k if llm_score else 0)
+    if candidates:
+        for _ in score_jobs_concurrently(candidates, resume_text):
+            pass
+    cards.sort(key=lambda card: (card['match_score'], card['similarity']), reverse=True)
+    # NaN (missing fields from the cleaned DataFrame) becomes null in the JSON output
+    return [{**{field: None if value != value else value for field, value in card['record'].items()},
+             'match_score': card['match_score'], 'similarity': round(card['similarity'], 4)}
+            for card in cards[:matches]]
+
+
+class Pipeline:
+    """Headless resume -> keyword -> scrape -> clean -> match run over many resumes
+
+    Each stage runs over the whole batch before the next: PDFs are parsed
+    in worker processes, keywords are extracted on the shared Groq pool,
+    every distinct keyword is scraped once in a single batch crawl, and
+    the cleaned jobs of a keyword are matched against all of its resumes.
+    """
+
+    def __init__(self, workers=PIPELINE_WORKERS, score_workers=PIPELINE_SCORE_WORKERS, scrape_workers=8,
+                 use_selenium=True, use_cache=True, incremental=False, store=True, top_k=None,
+                 matches=PIPELINE_MATCHES, llm_score=True):
+        self.workers = workers
+        self.score_workers = score_workers
+        self.scrape_workers = scrape_workers
+        self.use_selenium = use_selenium
+        self.use_cache = use_cache
+        self.incremental = incremental
+        self.store = store
+        self.top_k = top_k
+        self.matches = matches
+        self.llm_score = llm_score
+        self.timings = {}
+
+    def timed(self, stage, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        self.timings[stage] = time.perf_counter() - start
+        print(f"{stage}: {self.timings[stage]:.1f}s")
+        return result
+
+    def extract(self, pdfs):
+        """{path: text} of every readable PDF; failures are reported and left out"""
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+            results = list(executor.map(extract_resume, pdfs, chunksize=max(1, len(pdfs) // (self.workers * 4))))
+        texts = {}
+        for path, text, error in results:
+            if error or not text.strip():
+                print(f"Skipping {path}: {error or 'no text found'}")
+            else:
+                texts[path] = text
+        return texts
+
+    def keywords(self, texts):
+        """{path: search keyword}, extracted concurrently on the shared Groq pool
+        
+        Every request goes through the shared Groq rate limiter and is
+        retried on 429s; resumes whose extraction fails are reported and left out.
+        """
+        from app import extract_resume_keywords
+        from llm_limits import get_llm_executor
+        futures = {path: get_llm_executor().submit(extract_resume_keywords, text) for path, text in texts.items()}
+        keywords = {}
+        for path, future in futures.items():
+            try:
+                keyword = future.result()
+            except Exception as e:
+                print(f"Skipping {path}: keyword extraction failed: {e}")
+                continue
+            if keyword:
+                keywords[path] = keyword
+            else:
+                print(f"Skipping {path}: no keyword extracted")
+        return keywords
+
+    def scrape(self, keywords):
+        """{keyword: cleaned job records}, scraping and cleaning every distinct keyword once"""
+        from app import clean_jobs_data, jobs_to_dataframe
+        from job_store import get_job_store, normalize_keyword
+        from scrape import JobScraper
+        unique = sorted(set(keywords.values()))
+        scraper = JobScraper(use_selenium=self.use_selenium, use_cache=self.use_cache, incremental=self.incremental)
+        jobs = scraper.run_batch(unique, use_all_sources=True, max_workers=self.scrape_workers, store=False)
+
+        cleaned = {keyword: [] for keyword in unique}
+        if not jobs:
+            return cleaned
+
+        # Clean the deduplicated batch once, so a job found under several keywords is enriched once
+        jobs_df = jobs_to_dataframe(jobs)
+        jobs_df['Keywords'] = [job.get('Keywords') or [] for job in jobs]
+        try:
+            records = clean_jobs_data(jobs_df, ", ".join(unique), raise_errors=True).to_dict('records')
+            if self.store:
+                # Tagged with every keyword in their 'Keywords' lists
+                get_job_store().upsert(records)
+        except Exception as e:
+            print(f"Cleaning jobs failed: {e}")
+            return cleaned
+        # Listings are only remembered once their jobs are stored
+        if self.store:
+            scraper.save_sightings()
+
+        normalized = {normalize_keyword(keyword): keyword for keyword in unique}
+        for record in records:
+            for keyword in {normalize_keyword(keyword) for keyword in record['Keywords']} & normalized.keys():
+                cleaned[normalized[keyword]].append(record)
+        return cleaned
+
+    def match(self, texts, keywords, jobs, output):
+        """Score each resume against its keyword's jobs, writing one result per resume as it finishes"""
+        from app import LLM_RERANK_TOP_K
+        top_k = LLM_RERANK_TOP_K if self.top_k is None else self.top_k
+
+        def run(path):
+            keyword = keywords[path]
+            matches = match_resume(texts[path], jobs[keyword], top_k, self.matches, self.llm_score)
+            return {'resume': path, 'keyword': keyword, 'jobs_found': len(jobs[keyword]), 'matches': matches}
+
+        with ThreadPoolExecutor(max_workers=self.score_workers, thread_name_prefix="match") as executor:
+            for result in executor.map(run, keywords):
+                output(result)
+
+    def run(self, pdfs, output):
+        start = time.perf_counter()
+        texts = self.timed("extract", self.extract, pdfs)
+        keywords = self.timed("keywords", self.keywords, texts)
+        jobs = self.timed("scrape+clean", self.scrape, keywords) if keywords else {}
+        self.timed("match", self.match, texts, keywords, jobs, output)
+        elapsed = time.perf_counter() - start
+        print(f"Processed {len(keywords)}/{len(pdfs)} resumes ({len(jobs)} distinct keywords) in {elapsed:.1f}s "
+              f"({len(keywords) / elapsed if elapsed else 0:.2f} resumes/sec)")
+        return len(keywords)
+
+
+def main():
+    """Run the resume-to-matches pipeline over a directory of resume PDFs without the UI"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('paths', nargs='+', help="Resume PDFs or directories of PDFs")
+    parser.add_argument('--jsonl', help="Append one JSON result per resume to this file")
+    parser.add_argument('--no-store', action='store_true', help="Do not upsert scraped jobs into the job store")
+    parser.add_argument('--workers', type=int, default=PIPELINE_WORKERS, help="PDF extraction processes")
+    parser.add_argument('--score-workers', type=int, default=PIPELINE_SCORE_WORKERS, help="Resumes matched at once")
+    parser.add_argument('--scrape-workers', type=int, default=8, help="Concurrent keyword x source crawls")
+    parser.add_argument('--top-k', type=int, default=None, help="Jobs per resume re-ranked by the LLM")
+    parser.add_argument('--matches', type=int, default=PIPELINE_MATCHES, help="Matches written per resume")
+    parser.add_argument('--no-llm-score', action='store_true', help="Rank by local similarity only")
+    parser.add_argument('--no-selenium', action='store_true', help="Skip sources that need Chrome")
+    parser.add_argument('--no-cache', action='store_true', help="Bypass the HTTP response cache")
+    parser.add_argument('--incremental', action='store_true', help="Stop crawling at already-seen listing pages")
+    args = parser.parse_args()
+
+    pdfs = collect_pdfs(args.paths)
+    if not pdfs:
+        sys.exit("No PDFs found")
+
+    pipeline = Pipeline(workers=args.workers, score_workers=args.score_workers, scrape_workers=args.scrape_workers,
+                        use_selenium=not args.no_selenium, use_cache=not args.no_cache, incremental=args.incremental,
+                        store=not args.no_store, top_k=args.top_k, matches=args.matches,
+                        llm_score=not args.no_llm_score)
+
+    out = open(args.jsonl, 'a', encoding='utf-8') if args.jsonl else None
+
+    def output(result):
+        if out is not None:
+            out.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+            out.flush()
+        else:
+            best = result['matches'][0] if result['matches'] else None
+            print(f"{result['resume']}: {result['keyword']}, {result['jobs_found']} jobs"
+                  + (f", best match {best['Role']} at {best['Company']} ({best['match_score']}/10)" if best else ""))
+
+    print(f"Running pipeline over {len(pdfs)} resumes")
+    try:
+        pipeline.run(pdfs, output)
+    finally:
+        if out is not None:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class RateLimitConfig:
+    """Per-host pacing settings for the adaptive token bucket"""
+
+    def __init__(self, rate=0.5, min_rate=0.1, max_rate=2.0, burst=2,
+                 increase=0.1, backoff=0.5, slow_threshold=5.0):
+        self.rate = rate                        # Starting requests per second
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst                      # Tokens that may accumulate while idle
+        self.increase = increase                # Added to the rate after a healthy response
+        self.backoff = backoff                  # Rate multiplier on throttling or slow responses
+        self.slow_threshold = slow_threshold    # Seconds after which a response counts as slow
+
+
+# Pacing per job portal, keyed by host
+SOURCE_RATE_LIMITS = {
+    'internshala.com': RateLimitConfig(rate=0.5, max_rate=1.0),
+    'www.naukri.com': RateLimitConfig(rate=0.5, max_rate=2.0),
+    'www.linkedin.com': RateLimitConfig(rate=0.3, max_rate=1.0, burst=1),
+    'www.glassdoor.co.in': RateLimitConfig(rate=0.3, max_rate=1.0, burst=1),
+}
+
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+class AdaptiveTokenBucket:
+    """Token bucket whose refill rate follows the health of the host
+
+    Healthy responses raise the rate additively up to max_rate, while
+    429/503 responses and slow responses cut it multiplicatively. A
+    Retry-After header blocks the bucket until the given time.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.rate = config.rate
+        self.tokens = float(config.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+        # Metrics
+        self.requests = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+        self.fetch_time = 0.0
+
+    def refill(self, now):
+        self.tokens = min(self.config.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a request may be sent, return the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.refill(now)
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.wait_time += waited
+                    return waited
+                else:
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def record(self, status_code, elapsed, retry_after=None):
+        """Adjust the rate from the outcome of one request"""
+        config = self.config
+        with self.lock:
+            self.requests += 1
+            self.fetch_time += elapsed
+
+            if status_code in THROTTLE_STATUS_CODES or status_code is None or elapsed > config.slow_threshold:
+                if status_code in THROTTLE_STATUS_CODES:
+                    self.throttled += 1
+                self.rate = max(config.min_rate, self.rate * config.backoff)
+                if retry_after:
+                    self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            else:
+                self.rate = min(config.max_rate, self.rate + config.increase)
+
+    def metrics(self):
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'current_rate': round(self.rate, 3),
+                'wait_time': round(self.wait_time, 3),
+                'fetch_time': round(self.fetch_time, 3),
+            }
+
+
+class RateLimiter:
+    """Keeps one adaptive token bucket per host"""
+
+    def __init__(self, configs=None, default_config=None):
+        self.configs = dict(SOURCE_RATE_LIMITS if configs is None else configs)
+        self.default_config = default_config or RateLimitConfig()
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def configure(self, host, config):
+        """Override the pacing for a host, resetting its bucket"""
+        with self.lock:
+            self.configs[host] = config
+            self.buckets.pop(host, None)
+
+    def get_bucket(self, url):
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = AdaptiveTokenBucket(self.configs.get(host, self.default_config))
+            return self.buckets[host]
+
+    def acquire(self, url):
+        return self.get_bucket(url).acquire()
+
+    def record(self, url, status_code, elapsed, retry_after=None):
+        self.get_bucket(url).record(status_code, elapsed, retry_after)
+
+    def metrics(self):
+        """Per-host request counts, current rate and time spent waiting versus fetching"""
+        with self.lock:
+            buckets = dict(self.buckets)
+        return {host: bucket.metrics() for host, bucket in buckets.items()}
+
+    def report(self, since=None):
+        """Print per-host metrics; with a metrics() snapshot as `since`, only the traffic after it"""
+        per_run = since is not None
+        since = since or {}
+        print("\nRate limiter (waiting vs fetching)" + (" during this run:" if per_run else ", process totals:"))
+        for host, stats in self.metrics().items():
+            before = since.get(host, {})
+            requests = stats['requests'] - before.get('requests', 0)
+            if per_run and not requests:
+                continue
+            print(f"  {host}: {requests} requests, {stats['throttled'] - before.get('throttled', 0)} throttled, "
+                  f"waited {stats['wait_time'] - before.get('wait_time', 0):.1f}s, "
+                  f"fetched {stats['fetch_time'] - before.get('fetch_time', 0):.1f}s, "
+                  f"rate now {stats['current_rate']}/s")
+
+
+def parse_retry_after(value):
+    """Return the Retry-After header as seconds, ignoring HTTP-date values"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
@@ -1,22 +1,130 @@
-import requests
-from bs4 import BeautifulSoup
 import csv
+import hashlib
+import os
 import time
 import random
-from urllib.parse import urljoin, urlparse
 import re
 from datetime import datetime
 import json
-from selenium import webdriver
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
+from dedup import dedupe_jobs
+from driver_pool import get_driver_pool
+from extract import SourceSpec, FieldSpec
+from http_engine import get_engine
+from job_store import JOB_STORE_PATH, get_job_store, job_key
 import warnings
 warnings.filterwarnings('ignore')
 
+# Scraped jobs are kept in the job store; set SCRAPE_SAVE_CSV=1 to also write CSV snapshots
+SCRAPE_OUTPUT_DIR = os.getenv('SCRAPE_OUTPUT_DIR', '.')
+SCRAPE_SAVE_CSV = os.getenv('SCRAPE_SAVE_CSV', '0').lower() in ('1', 'true', 'yes')
+
+# Incremental runs stop paginating a source once this share of a page was seen before
+INCREMENTAL_STOP_RATIO = float(os.getenv('INCREMENTAL_STOP_RATIO', 0.8))
+
+CSV_FIELDNAMES = ['Company', 'Role', 'Location', 'Stipend (₹/month)', 'Apply Link', 'EmailID']
+
+# One spec per job portal: listing URL, job card selectors and ordered
+# fallback selectors for each field. Adding a source means adding a spec.
+SOURCE_SPECS = {
+    'Internshala': SourceSpec(
+        name='Internshala',
+        base_url="https://internshala.com",
+        url_template="https://internshala.com/internships/keywords-{keywords}/page-{page}",
+        cards=['div.internship_meta'],
+        fields={
+            'company': FieldSpec('p.company-name', 'a.link_display_like_text'),
+            'role': FieldSpec('h3.heading_4_5', 'p.profile'),
+            'location': FieldSpec('p.location-names', 'a[id*="location_names_"]'),
+            'stipend': FieldSpec('span.stipend', 'p.stipend'),
+            'apply_link': FieldSpec('a.view_detail_button', 'a[href*="/internship/detail/"]', attr='href'),
+        },
+    ),
+    'Naukri': SourceSpec(
+        name='Naukri',
+        base_url="https://www.naukri.com",
+        url_template="https://www.naukri.com/{keywords}-jobs?k={keywords}&l=&page={page}",
+        cards=['article.jobTuple', 'div.jobTuple', 'div.row', 'div[data-job-id]'],
+        fields={
+            'company': FieldSpec('a.subTitle', 'span.companyName', 'div.companyName', 'a.companyName'),
+            'role': FieldSpec('a.title', 'h3.title', 'a.jobTitle', 'div.title'),
+            'location': FieldSpec('span.locationsContainer', 'div.location', 'span.location'),
+            'stipend': FieldSpec('span.salary', 'div.salary', 'span.salaryRange'),
+            'apply_link': FieldSpec('a.title', 'a.jobTitle', 'a[href*="/job-listings-"]', attr='href'),
+        },
+    ),
+    'LinkedIn': SourceSpec(
+        name='LinkedIn',
+        base_url="https://www.linkedin.com",
+        url_template="https://www.linkedin.com/jobs/search?keywords={keywords}&location=India&geoId=102713980&f_TPR=r86400&position=1&pageNum=0",
+        cards=['div.base-card', 'div.job-search-card', 'li.result-card'],
+        fields={
+            'company': FieldSpec('h4.base-search-card__subtitle', 'a.hidden-nested-link', 'span.job-search-card__subtitle-link'),
+            'role': FieldSpec('h3.base-search-card__title', 'a.result-card__title-link'),
+            'location': FieldSpec('span.job-search-card__location', 'span.job-result-card__location'),
+            'apply_link': FieldSpec('a.base-card__full-link', 'a.result-card__title-link', attr='href'),
+        },
+    ),
+    'Glassdoor': SourceSpec(
+        name='Glassdoor',
+        base_url="https://www.glassdoor.co.in",
+        url_template="https://www.glassdoor.co.in/Job/jobs.htm?sc.keyword={keywords}&locT=N&locId=115&p={page}",
+        cards=['li.react-job-listing', 'div.jobContainer', 'article.jobContainer'],
+        fields={
+            'company': FieldSpec('span.employerName', 'div.employerName'),
+            'role': FieldSpec('a[data-test="job-title"]', 'span.jobTitle'),
+            'location': FieldSpec('span.jobLocation', 'div.jobLocation'),
+            'stipend': FieldSpec('span.salaryText', 'div.salaryEstimate'),
+            'apply_link': FieldSpec('a[data-test="job-title"]', 'a.jobTitle', attr='href'),
+        },
+    ),
+}
+
+def csv_output_path(prefix):
+    """Unique timestamped CSV path in SCRAPE_OUTPUT_DIR (concurrent runs never share a file)"""
+    os.makedirs(SCRAPE_OUTPUT_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(SCRAPE_OUTPUT_DIR, f"{prefix}_{timestamp}_{uuid.uuid4().hex[:6]}.csv")
+
+def listing_hash(record):
+    """Hash of the raw fields of an extracted listing, used to notice changed listings"""
+    raw = '\x1f'.join(str(record.get(field, '')).strip() for field in ('company', 'role', 'location', 'stipend'))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def write_jobs_csv(filename, jobs):
+    """Write job records to a CSV file"""
+    try:
+        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES, extrasaction='ignore')
+            
+            writer.writeheader()
+            for job in jobs:
+                writer.writerow(job)
+        
+        print(f"Data saved to {filename}")
+        print(f"Total unique jobs/internships found: {len(jobs)}")
+        
+    except Exception as e:
+        print(f"Error saving to CSV: {e}")
+
+_output_writer = None
+_output_writer_lock = threading.Lock()
+
+def get_output_writer():
+    """Process-wide single thread that persists scraped jobs off the request path"""
+    global _output_writer
+    with _output_writer_lock:
+        if _output_writer is None:
+            _output_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-writer")
+        return _output_writer
+
 class JobScraper:
-    def __init__(self, use_selenium=True):
+    def __init__(self, use_selenium=True, use_cache=True, incremental=False):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -25,9 +133,16 @@ class JobScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
+        self.http = get_engine()  # Pooled keep-alive connections shared by all scrapers
+        self.use_cache = use_cache  # False forces fresh downloads of listing pages
         self.jobs_data = []
+        self.jobs_lock = threading.Lock()  # Sources append concurrently
+        self.source_timings = {}
+        self.incremental = incremental  # Skip listings seen before and stop paging at known pages
+        self.seen_listings = {}  # (source, keywords) -> {job_key: content_hash} from earlier runs
+        self.sightings = []  # (source, keywords, job_key, content_hash) of listings kept during this run
         self.use_selenium = use_selenium
-        self.driver = None
+        self.driver_pool = None
         self.target_count = 50  # Target number of jobs to scrape
         
         # Dummy data for replacements
@@ -55,19 +170,11 @@ class JobScraper:
             self.setup_selenium()
     
     def setup_selenium(self):
-        """Setup Selenium WebDriver"""
+        """Attach to the shared pool of warm Selenium WebDrivers"""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')  # Run in background
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            print("Selenium WebDriver initialized successfully")
+            self.driver_pool = get_driver_pool()
+            self.driver_pool.warm(1)
+            print("Selenium WebDriver pool ready")
         except Exception as e:
             print(f"Selenium setup failed: {e}")
             print("Falling back to requests-only mode")
@@ -92,12 +199,6 @@ class JobScraper:
         
         return random.choice(patterns)
     
-    def clean_text(self, text):
-        """Clean and normalize text data"""
-        if not text:
-            return ""
-        return re.sub(r'\s+', ' ', text.strip())
-    
     def is_valid_job_data(self, company, role, apply_link):
         """Check if job data is valid (company and apply_link must not be N/A)"""
         invalid_values = ['n/a', 'na', '', 'null', 'none', 'not specified', 'not available']
@@ -139,6 +240,96 @@ class JobScraper:
         
         return location, stipend, role
     
+    def add_job(self, job):
+        """Append a job record, safe to call from concurrent source threads"""
+        with self.jobs_lock:
+            self.jobs_data.append(job)
+    
+    def add_jobs_from_records(self, source, records, keywords, limit, jobs_found):
+        """Validate extracted records, fill missing fields and add them; returns the updated count
+        
+        Only added records are remembered as sightings, so listings past
+        the limit or rejected as invalid are picked up again next run.
+        """
+        sightings = []
+        for record in records:
+            if jobs_found >= limit:
+                break
+            
+            company = record.get('company', '')
+            role = record.get('role', '')
+            location = record.get('location', '')
+            stipend = record.get('stipend', '')
+            apply_link = record.get('apply_link', '')
+            
+            # Check if valid job data (company and apply_link must not be N/A)
+            if not self.is_valid_job_data(company, role, apply_link):
+                continue
+            
+            # Fill dummy data for missing fields
+            location, stipend, role = self.fill_dummy_data(location, stipend, role, keywords)
+            
+            # Generate email
+            email = self.generate_email(company)
+            
+            self.add_job({
+                'Company': company,
+                'Role': role,
+                'Location': location,
+                'Stipend (₹/month)': stipend,
+                'Apply Link': apply_link,
+                'EmailID': email,
+                'Source': source,
+                'Keywords': [keywords]  # Searches that found this job, merged by dedup
+            })
+            sightings.append((source, keywords, job_key({'Apply Link': apply_link}), listing_hash(record)))
+            
+            jobs_found += 1
+        
+        with self.jobs_lock:
+            self.sightings.extend(sightings)
+        return jobs_found
+    
+    def filter_known(self, source, keywords, records):
+        """In incremental mode, drop listings already seen unchanged
+        
+        Returns (records to process, number of known listings dropped).
+        Dropped listings are sightings again, which keeps their stored
+        jobs current.
+        """
+        if not self.incremental:
+            return records, 0
+        fresh = []
+        sightings = []
+        seen = self.seen_listings.get((source, keywords), {})
+        for record in records:
+            if not record.get('apply_link'):
+                fresh.append(record)
+                continue
+            key, content_hash = job_key({'Apply Link': record['apply_link']}), listing_hash(record)
+            if seen.get(key) == content_hash:
+                sightings.append((source, keywords, key, content_hash))
+            else:
+                fresh.append(record)
+        with self.jobs_lock:
+            self.sightings.extend(sightings)
+        return fresh, len(sightings)
+    
+    def page_mostly_known(self, spec, page, known, fresh):
+        """True when an incremental run should stop paginating a source"""
+        if not self.incremental or known == 0 or known < INCREMENTAL_STOP_RATIO * (known + len(fresh)):
+            return False
+        print(f"{spec.name} page {page}: {known} of {known + len(fresh)} listings already seen, stopping here")
+        return True
+    
+    def extract_page(self, spec, html, page):
+        """Run a source spec over one listing page and report how long parsing took"""
+        start = time.perf_counter()
+        records = spec.extract(html)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Found {len(records)} job cards on {spec.name} page {page} (parsed in {elapsed_ms:.0f} ms)")
+        return records
+    
     def scrape_internshala_selenium(self, keywords, max_pages=5):
         """Scrape Internshala using Selenium for dynamic content"""
         print(f"Scraping Internshala with Selenium for keywords: {keywords}")
@@ -147,503 +338,283 @@ class JobScraper:
             print("Selenium not available, skipping Internshala")
             return
         
+        spec = SOURCE_SPECS['Internshala']
+        limit = self.target_count // 4  # Limit per source
         jobs_found = 0
         
+        # Borrow a warm driver from the shared pool for the whole crawl
+        pooled = self.driver_pool.checkout()
+        driver = pooled.driver
+        
         try:
             for page in range(1, max_pages + 1):
-                if jobs_found >= self.target_count // 4:  # Limit per source
+                if jobs_found >= limit:
                     break
                     
-                url = f"https://internshala.com/internships/keywords-{keywords}/page-{page}"
+                url = spec.page_url(keywords, page)
+                pooled.pages += 1
                 
-                self.driver.get(url)
-                time.sleep(3)  # Wait for page to load
+                # Pace page loads with the shared per-host rate limiter
+                self.http.limiter.acquire(url)
+                load_start = time.perf_counter()
+                try:
+                    driver.get(url)
+                except Exception:
+                    self.http.limiter.record(url, None, time.perf_counter() - load_start)
+                    raise
+                self.http.limiter.record(url, 200, time.perf_counter() - load_start)
                 
-                # Wait for internship cards to load
+                # Lean drivers return at DOMContentLoaded, so readiness is this wait alone
                 try:
-                    WebDriverWait(self.driver, 10).until(
+                    WebDriverWait(driver, 10).until(
                         EC.presence_of_element_located((By.CLASS_NAME, "internship_meta"))
                     )
                 except:
                     print(f"No internship cards found on page {page}")
                     continue
                 
-                # Get page source and parse with BeautifulSoup
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                
-                # Find internship cards
-                internship_cards = soup.find_all('div', class_='internship_meta')
-                print(f"Found {len(internship_cards)} internship cards on page {page}")
-                
-                for card in internship_cards:
-                    if jobs_found >= self.target_count // 4:
-                        break
-                        
-                    try:
-                        # Extract company name
-                        company_elem = card.find('p', class_='company-name')
-                        if not company_elem:
-                            company_elem = card.find('a', class_='link_display_like_text')
-                        company = self.clean_text(company_elem.text) if company_elem else ""
-                        
-                        # Extract role
-                        role_elem = card.find('h3', class_='heading_4_5')
-                        if not role_elem:
-                            role_elem = card.find('p', class_='profile')
-                        role = self.clean_text(role_elem.text) if role_elem else ""
-                        
-                        # Extract location
-                        location_elem = card.find('p', class_='location-names')
-                        if not location_elem:
-                            location_elem = card.find('a', {'id': re.compile(r'location_names_')})
-                        location = self.clean_text(location_elem.text) if location_elem else ""
-                        
-                        # Extract stipend
-                        stipend_elem = card.find('span', class_='stipend')
-                        if not stipend_elem:
-                            stipend_elem = card.find('p', class_='stipend')
-                        stipend = self.clean_text(stipend_elem.text) if stipend_elem else ""
-                        
-                        # Extract apply link
-                        apply_elem = card.find('a', class_='view_detail_button')
-                        if not apply_elem:
-                            apply_elem = card.find('a', {'href': re.compile(r'/internship/detail/')})
-                        
-                        apply_link = ""
-                        if apply_elem and apply_elem.get('href'):
-                            apply_link = urljoin("https://internshala.com", apply_elem['href'])
-                        
-                        # Check if valid job data (company and apply_link must not be N/A)
-                        if not self.is_valid_job_data(company, role, apply_link):
-                            continue
-                        
-                        # Fill dummy data for missing fields
-                        location, stipend, role = self.fill_dummy_data(location, stipend, role, keywords)
-                        
-                        # Generate email
-                        email = self.generate_email(company)
-                        
-                        self.jobs_data.append({
-                            'Company': company,
-                            'Role': role,
-                            'Location': location,
-                            'Stipend (₹/month)': stipend,
-                            'Apply Link': apply_link,
-                            'EmailID': email
-                        })
-                        
-                        jobs_found += 1
-                        
-                    except Exception as e:
-                        print(f"Error extracting internship data: {e}")
-                        continue
-                
+                records = self.extract_page(spec, driver.page_source, page)
+                records, known = self.filter_known(spec.name, keywords, records)
+                jobs_found = self.add_jobs_from_records(spec.name, records, keywords, limit, jobs_found)
                 print(f"Scraped {jobs_found} valid internships from Internshala so far")
-                time.sleep(random.uniform(2, 4))
+                if self.page_mostly_known(spec, page, known, records):
+                    break
                 
         except Exception as e:
             print(f"Error scraping Internshala: {e}")
+        finally:
+            self.driver_pool.checkin(pooled)
     
-    def scrape_naukri_improved(self, keywords, max_pages=5):
-        """Improved Naukri scraper with better selectors and validation"""
-        print(f"Scraping Naukri for keywords: {keywords}")
-        
-        session = requests.Session()
-        session.headers.update(self.headers)
-        
+    def scrape_listing_pages(self, spec, keywords, max_pages, limit):
+        """Fetch listing pages of a requests-based source and extract jobs with its spec"""
         jobs_found = 0
-        
-        for page in range(1, max_pages + 1):
-            if jobs_found >= self.target_count // 4:  # Limit per source
+        urls = [spec.page_url(keywords, page) for page in range(1, max_pages + 1)]
+        
+        # Several pages are fetched concurrently, results come back in page order. Incremental
+        # runs keep a narrow window so a known first page doesn't drag in the whole listing.
+        window = 2 if self.incremental else None
+        pages = self.http.fetch_iter(urls, headers=self.headers, window=window, use_cache=self.use_cache)
+        for page, (url, pending) in enumerate(pages, start=1):
+            if jobs_found >= limit:
                 break
                 
             try:
-                # Updated Naukri URL format
-                url = f"https://www.naukri.com/{keywords}-jobs?k={keywords}&l=&page={page}"
-                
-                response = session.get(url)
+                response = pending.result()
                 if response.status_code != 200:
-                    print(f"Failed to fetch page {page} from Naukri (Status: {response.status_code})")
+                    print(f"Failed to fetch {spec.name} page {page} (Status: {response.status_code})")
                     continue
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Multiple selectors for job cards
-                job_cards = soup.find_all('article', class_='jobTuple') or \
-                           soup.find_all('div', class_='jobTuple') or \
-                           soup.find_all('div', class_='row') or \
-                           soup.find_all('div', {'data-job-id': True})
-                
-                print(f"Found {len(job_cards)} job cards on page {page}")
-                
-                for card in job_cards:
-                    if jobs_found >= self.target_count // 4:
-                        break
-                        
-                    try:
-                        # Extract company name - multiple selectors
-                        company_elem = card.find('a', class_='subTitle') or \
-                                     card.find('span', class_='companyName') or \
-                                     card.find('div', class_='companyName') or \
-                                     card.find('a', class_='companyName')
-                        company = self.clean_text(company_elem.text) if company_elem else ""
-                        
-                        # Extract role - multiple selectors
-                        role_elem = card.find('a', class_='title') or \
-                                   card.find('h3', class_='title') or \
-                                   card.find('a', class_='jobTitle') or \
-                                   card.find('div', class_='title')
-                        role = self.clean_text(role_elem.text) if role_elem else ""
-                        
-                        # Extract location - multiple selectors
-                        location_elem = card.find('span', class_='locationsContainer') or \
-                                       card.find('div', class_='location') or \
-                                       card.find('span', class_='location')
-                        location = self.clean_text(location_elem.text) if location_elem else ""
-                        
-                        # Extract salary - multiple selectors
-                        salary_elem = card.find('span', class_='salary') or \
-                                     card.find('div', class_='salary') or \
-                                     card.find('span', class_='salaryRange')
-                        stipend = self.clean_text(salary_elem.text) if salary_elem else ""
-                        
-                        # Extract apply link - multiple selectors
-                        apply_elem = card.find('a', class_='title') or \
-                                    card.find('a', class_='jobTitle') or \
-                                    card.find('a', {'href': re.compile(r'/job-listings-')})
-                        
-                        apply_link = ""
-                        if apply_elem and apply_elem.get('href'):
-                            href = apply_elem['href']
-                            if href.startswith('http'):
-                                apply_link = href
-                            else:
-                                apply_link = urljoin("https://www.naukri.com", href)
-                        
-                        # Check if valid job data
-                        if not self.is_valid_job_data(company, role, apply_link):
-                            continue
-                        
-                        # Fill dummy data for missing fields
-                        location, stipend, role = self.fill_dummy_data(location, stipend, role, keywords)
-                        
-                        # Generate email
-                        email = self.generate_email(company)
-                        
-                        self.jobs_data.append({
-                            'Company': company,
-                            'Role': role,
-                            'Location': location,
-                            'Stipend (₹/month)': stipend,
-                            'Apply Link': apply_link,
-                            'EmailID': email
-                        })
-                        
-                        jobs_found += 1
-                        
-                    except Exception as e:
-                        print(f"Error extracting job data: {e}")
-                        continue
-                
-                print(f"Scraped {jobs_found} valid jobs from Naukri so far")
-                time.sleep(random.uniform(2, 4))
+                records = self.extract_page(spec, response.content, page)
+                records, known = self.filter_known(spec.name, keywords, records)
+                jobs_found = self.add_jobs_from_records(spec.name, records, keywords, limit, jobs_found)
+                print(f"Scraped {jobs_found} valid jobs from {spec.name} so far")
+                if self.page_mostly_known(spec, page, known, records):
+                    break
                 
             except Exception as e:
-                print(f"Error scraping Naukri page {page}: {e}")
+                print(f"Error scraping {spec.name} page {page}: {e}")
                 continue
+        
+        return jobs_found
+    
+    def scrape_naukri_improved(self, keywords, max_pages=5):
+        """Improved Naukri scraper with better selectors and validation"""
+        print(f"Scraping Naukri for keywords: {keywords}")
+        self.scrape_listing_pages(SOURCE_SPECS['Naukri'], keywords, max_pages, self.target_count // 4)
     
     def scrape_linkedin_jobs(self, keywords, max_results=15):
         """Scrape LinkedIn Jobs with better validation"""
         print(f"Scraping LinkedIn Jobs for keywords: {keywords}")
-        
-        jobs_found = 0
-        
-        try:
-            # LinkedIn job search URL
-            url = f"https://www.linkedin.com/jobs/search?keywords={keywords}&location=India&geoId=102713980&f_TPR=r86400&position=1&pageNum=0"
-            
-            session = requests.Session()
-            session.headers.update(self.headers)
-            
-            response = session.get(url)
-            if response.status_code != 200:
-                print(f"Failed to fetch LinkedIn jobs (Status: {response.status_code})")
-                return
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find job cards
-            job_cards = soup.find_all('div', class_='base-card') or \
-                       soup.find_all('div', class_='job-search-card') or \
-                       soup.find_all('li', class_='result-card')
-            
-            print(f"Found {len(job_cards)} job cards on LinkedIn")
-            
-            for card in job_cards:
-                if jobs_found >= max_results:
-                    break
-                    
-                try:
-                    # Extract company name
-                    company_elem = card.find('h4', class_='base-search-card__subtitle') or \
-                                  card.find('a', class_='hidden-nested-link') or \
-                                  card.find('span', class_='job-search-card__subtitle-link')
-                    company = self.clean_text(company_elem.text) if company_elem else ""
-                    
-                    # Extract role
-                    role_elem = card.find('h3', class_='base-search-card__title') or \
-                               card.find('a', class_='result-card__title-link')
-                    role = self.clean_text(role_elem.text) if role_elem else ""
-                    
-                    # Extract location
-                    location_elem = card.find('span', class_='job-search-card__location') or \
-                                   card.find('span', class_='job-result-card__location')
-                    location = self.clean_text(location_elem.text) if location_elem else ""
-                    
-                    # Extract apply link
-                    apply_elem = card.find('a', class_='base-card__full-link') or \
-                                card.find('a', class_='result-card__title-link')
-                    
-                    apply_link = ""
-                    if apply_elem and apply_elem.get('href'):
-                        apply_link = apply_elem['href']
-                        if not apply_link.startswith('http'):
-                            apply_link = urljoin("https://www.linkedin.com", apply_link)
-                    
-                    # Check if valid job data
-                    if not self.is_valid_job_data(company, role, apply_link):
-                        continue
-                    
-                    # LinkedIn doesn't usually show salary in search results
-                    stipend = ""
-                    
-                    # Fill dummy data for missing fields
-                    location, stipend, role = self.fill_dummy_data(location, stipend, role, keywords)
-                    
-                    # Generate email
-                    email = self.generate_email(company)
-                    
-                    self.jobs_data.append({
-                        'Company': company,
-                        'Role': role,
-                        'Location': location,
-                        'Stipend (₹/month)': stipend,
-                        'Apply Link': apply_link,
-                        'EmailID': email
-                    })
-                    
-                    jobs_found += 1
-                    
-                except Exception as e:
-                    print(f"Error extracting LinkedIn job data: {e}")
-                    continue
-            
-            print(f"Scraped {jobs_found} valid jobs from LinkedIn")
-            time.sleep(random.uniform(2, 4))
-            
-        except Exception as e:
-            print(f"Error scraping LinkedIn: {e}")
+        # LinkedIn serves a single search page; it doesn't usually show salary in search results
+        self.scrape_listing_pages(SOURCE_SPECS['LinkedIn'], keywords, 1, max_results)
     
     def scrape_glassdoor_jobs(self, keywords, max_pages=3):
         """Scrape Glassdoor Jobs with better validation"""
         print(f"Scraping Glassdoor for keywords: {keywords}")
-        
-        session = requests.Session()
-        session.headers.update(self.headers)
-        
-        jobs_found = 0
-        
-        for page in range(1, max_pages + 1):
-            if jobs_found >= self.target_count // 4:  # Limit per source
-                break
-                
-            try:
-                url = f"https://www.glassdoor.co.in/Job/jobs.htm?sc.keyword={keywords}&locT=N&locId=115&p={page}"
-                
-                response = session.get(url)
-                if response.status_code != 200:
-                    print(f"Failed to fetch Glassdoor page {page}")
-                    continue
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find job listings
-                job_cards = soup.find_all('li', class_='react-job-listing') or \
-                           soup.find_all('div', class_='jobContainer') or \
-                           soup.find_all('article', class_='jobContainer')
-                
-                print(f"Found {len(job_cards)} job cards on Glassdoor page {page}")
-                
-                for card in job_cards:
-                    if jobs_found >= self.target_count // 4:
-                        break
-                        
-                    try:
-                        # Extract company name
-                        company_elem = card.find('span', class_='employerName') or \
-                                      card.find('div', class_='employerName')
-                        company = self.clean_text(company_elem.text) if company_elem else ""
-                        
-                        # Extract role
-                        role_elem = card.find('a', {'data-test': 'job-title'}) or \
-                                   card.find('span', class_='jobTitle')
-                        role = self.clean_text(role_elem.text) if role_elem else ""
-                        
-                        # Extract location
-                        location_elem = card.find('span', class_='jobLocation') or \
-                                       card.find('div', class_='jobLocation')
-                        location = self.clean_text(location_elem.text) if location_elem else ""
-                        
-                        # Extract salary
-                        salary_elem = card.find('span', class_='salaryText') or \
-                                     card.find('div', class_='salaryEstimate')
-                        stipend = self.clean_text(salary_elem.text) if salary_elem else ""
-                        
-                        # Extract apply link
-                        apply_elem = card.find('a', {'data-test': 'job-title'}) or \
-                                    card.find('a', class_='jobTitle')
-                        
-                        apply_link = ""
-                        if apply_elem and apply_elem.get('href'):
-                            apply_link = urljoin("https://www.glassdoor.co.in", apply_elem['href'])
-                        
-                        # Check if valid job data
-                        if not self.is_valid_job_data(company, role, apply_link):
-                            continue
-                        
-                        # Fill dummy data for missing fields
-                        location, stipend, role = self.fill_dummy_data(location, stipend, role, keywords)
-                        
-                        # Generate email
-                        email = self.generate_email(company)
-                        
-                        self.jobs_data.append({
-                            'Company': company,
-                            'Role': role,
-                            'Location': location,
-                            'Stipend (₹/month)': stipend,
-                            'Apply Link': apply_link,
-                            'EmailID': email
-                        })
-                        
-                        jobs_found += 1
-                        
-                    except Exception as e:
-                        print(f"Error extracting Glassdoor job data: {e}")
-                        continue
-                
-                print(f"Scraped {jobs_found} valid jobs from Glassdoor so far")
-                time.sleep(random.uniform(2, 4))
-                
-            except Exception as e:
-                print(f"Error scraping Glassdoor page {page}: {e}")
-                continue
+        self.scrape_listing_pages(SOURCE_SPECS['Glassdoor'], keywords, max_pages, self.target_count // 4)
     
     def remove_duplicates(self):
-        """Remove duplicate job entries based on company and role"""
-        seen = set()
-        unique_jobs = []
-        
-        for job in self.jobs_data:
-            key = (job['Company'].lower(), job['Role'].lower())
-            if key not in seen:
-                seen.add(key)
-                unique_jobs.append(job)
-        
+        """Merge duplicate job entries, including near-duplicates of one posting across sources"""
         original_count = len(self.jobs_data)
-        self.jobs_data = unique_jobs
+        self.jobs_data = dedupe_jobs(self.jobs_data)
         print(f"Removed {original_count - len(self.jobs_data)} duplicate entries")
     
-    def save_to_csv(self, filename=None):
-        """Save scraped data to CSV file"""
+    def save_to_csv(self, filename=None, background=False):
+        """Save scraped data to CSV file
+        
+        With background=True a snapshot of the rows is written on the shared
+        output writer thread and a future is returned instead of the filename.
+        """
         if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"jobs_internships_{timestamp}.csv"
+            filename = csv_output_path("jobs_internships")
         
         if not self.jobs_data:
             print("No data to save!")
-            return
+            return None
         
-        # Remove duplicates before saving
-        self.remove_duplicates()
+        if background:
+            return get_output_writer().submit(write_jobs_csv, filename, list(self.jobs_data))
+        write_jobs_csv(filename, self.jobs_data)
+        return filename
+    
+    def save_sightings(self, background=False):
+        """Remember every listing seen this run so later incremental runs can skip it"""
+        by_search = {}
+        for source, keywords, key, content_hash in self.sightings:
+            by_search.setdefault((source, keywords), []).append((key, content_hash))
+        
+        store = get_job_store()
+        for (source, keywords), listings in by_search.items():
+            if background:
+                get_output_writer().submit(store.mark_seen, source, keywords, listings)
+            else:
+                store.mark_seen(source, keywords, listings)
+    
+    def save_to_store(self, background=False):
+        """Upsert scraped data into the job store under the keywords that found each job
         
+        Returns the number of new jobs (or a future).
+        """
+        if not self.jobs_data:
+            return 0
+        
+        store = get_job_store()
+        if background:
+            return get_output_writer().submit(store.upsert, list(self.jobs_data))
+        new_jobs = store.upsert(self.jobs_data)
+        print(f"Stored {len(self.jobs_data)} jobs ({new_jobs} new) in the job store")
+        return new_jobs
+    
+    def get_sources(self, use_all_sources=True):
+        """Return (name, scrape function) pairs for the selected job portals"""
+        if use_all_sources:
+            return [
+                ("Internshala", self.scrape_internshala_selenium),
+                ("Naukri", self.scrape_naukri_improved),
+                ("LinkedIn", self.scrape_linkedin_jobs),
+                ("Glassdoor", self.scrape_glassdoor_jobs),
+            ]
+        # Just scrape the most reliable sources
+        return [
+            ("Naukri", self.scrape_naukri_improved),
+            ("LinkedIn", self.scrape_linkedin_jobs),
+        ]
+    
+    def run_source(self, name, scrape_func, keywords, label=None):
+        """Run a single source scraper and record how long it took"""
+        start = time.perf_counter()
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['Company', 'Role', 'Location', 'Stipend (₹/month)', 'Apply Link', 'EmailID']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for job in self.jobs_data:
-                    writer.writerow(job)
-            
-            print(f"Data saved to {filename}")
-            print(f"Total unique jobs/internships found: {len(self.jobs_data)}")
-            
+            if self.incremental:
+                self.seen_listings[(name, keywords)] = get_job_store().seen_listings(name, keywords)
+            scrape_func(keywords)
         except Exception as e:
-            print(f"Error saving to CSV: {e}")
+            print(f"Error with {label or name}: {e}")
+        finally:
+            self.source_timings[label or name] = time.perf_counter() - start
     
-    def run_scraper(self, keywords, use_all_sources=True):
-        """Main function to run the scraper"""
+    def report_timings(self, total_time):
+        """Print per-source timings for the last run"""
+        print("\nSource timings:")
+        for name, elapsed in self.source_timings.items():
+            print(f"  {name}: {elapsed:.1f}s")
+        print(f"  Total wall time: {total_time:.1f}s")
+    
+    def run_scraper(self, keywords, use_all_sources=True, concurrent=True, store=True, save=SCRAPE_SAVE_CSV, save_async=False):
+        """Main function to run the scraper
+        
+        With concurrent=True every source runs in its own thread, so the
+        total wall time is close to the slowest source instead of the sum.
+        Returns the deduplicated job records, which are also upserted into
+        the job store (store) and written as a CSV snapshot (save). With
+        save_async=True both happen in the background. Incremental scrapers
+        return only listings that are new or changed since earlier runs.
+        """
         print(f"Starting enhanced job scraper for keywords: {keywords}")
         print(f"Target: {self.target_count} jobs/internships")
         print("="*60)
         
         # Clear existing data
         self.jobs_data = []
+        self.source_timings = {}
+        self.seen_listings = {}
+        self.sightings = []
+        
+        sources = self.get_sources(use_all_sources)
+        start = time.perf_counter()
+        limiter_before = self.http.limiter.metrics()  # The limiter is shared, so report only this run's traffic
         
         # Scrape different job portals
-        if use_all_sources:
-            # Scrape Internshala with Selenium
-            try:
-                self.scrape_internshala_selenium(keywords)
-            except Exception as e:
-                print(f"Error with Internshala: {e}")
-            
-            # Scrape Naukri with improved selectors
-            try:
-                self.scrape_naukri_improved(keywords)
-            except Exception as e:
-                print(f"Error with Naukri: {e}")
-            
-            # Scrape LinkedIn Jobs
-            try:
-                self.scrape_linkedin_jobs(keywords)
-            except Exception as e:
-                print(f"Error with LinkedIn: {e}")
-            
-            # Scrape Glassdoor
-            try:
-                self.scrape_glassdoor_jobs(keywords)
-            except Exception as e:
-                print(f"Error with Glassdoor: {e}")
+        if concurrent:
+            with ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="source") as executor:
+                futures = [executor.submit(self.run_source, name, func, keywords) for name, func in sources]
+                for future in futures:
+                    future.result()
         else:
-            # Just scrape the most reliable sources
-            try:
-                self.scrape_naukri_improved(keywords)
-            except Exception as e:
-                print(f"Error with Naukri: {e}")
-            
-            try:
-                self.scrape_linkedin_jobs(keywords)
-            except Exception as e:
-                print(f"Error with LinkedIn: {e}")
+            for name, func in sources:
+                self.run_source(name, func, keywords)
         
-        # Save to CSV
-        self.save_to_csv()
+        self.report_timings(time.perf_counter() - start)
+        self.http.limiter.report(since=limiter_before)
+        
+        # Remove duplicates before handing the data over
+        self.remove_duplicates()
         
-        # Cleanup
-        if self.driver:
-            self.driver.quit()
+        # Persist the jobs; callers get the records directly
+        self.persist(store, save, save_async)
         
+        # Drivers stay warm in the shared pool for the next run
         return self.jobs_data
     
-    def __del__(self):
-        """Cleanup WebDriver"""
-        if hasattr(self, 'driver') and self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
+    def persist(self, store, save, save_async):
+        """Store the deduplicated jobs, write the CSV snapshot and remember this run's sightings
+        
+        Sightings are only saved along with the stored jobs; callers that
+        store the jobs themselves (store=False) call save_sightings() after.
+        """
+        if store:
+            self.save_to_store(background=save_async)
+            self.save_sightings(background=save_async)
+        if save:
+            self.save_to_csv(background=save_async)
+    
+    def run_batch(self, keywords_list, use_all_sources=True, max_workers=8,
+                  store=True, save=SCRAPE_SAVE_CSV, save_async=False):
+        """Scrape several keywords in one pass
+        
+        Every keyword x source crawl is a work unit on one worker
+        pool; each crawl fetches its pages concurrently through the shared
+        HTTP engine, and Selenium crawls share the warm driver pool. All
+        results are deduplicated together at the end, so a job found under
+        several keywords is returned (and stored) once, tagged with every
+        keyword in its 'Keywords' field.
+        """
+        searches = list(dict.fromkeys(keywords_list))
+        print(f"Starting batch job scraper for {len(searches)} keywords: {', '.join(searches)}")
+        print("="*60)
+        
+        # Clear existing data
+        self.jobs_data = []
+        self.source_timings = {}
+        self.seen_listings = {}
+        self.sightings = []
+        
+        units = [(name, func, search) for search in searches for name, func in self.get_sources(use_all_sources)]
+        start = time.perf_counter()
+        limiter_before = self.http.limiter.metrics()
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(units)), thread_name_prefix="batch") as executor:
+            futures = [executor.submit(self.run_source, name, func, search, f"{name} [{search}]")
+                       for name, func, search in units]
+            for future in futures:
+                future.result()
+        
+        self.report_timings(time.perf_counter() - start)
+        self.http.limiter.report(since=limiter_before)
+        
+        # One dedup pass across every keyword
+        self.remove_duplicates()
+        self.persist(store, save, save_async)
+        return self.jobs_data
 
 # Example usage
 def main():
@@ -651,10 +622,11 @@ def main():
     print("=" * 40)
     
     # Get user input
-    keywords = input("Enter keywords to search for (e.g., 'python', 'data science', 'web development'): ").strip()
+    keywords = input("Enter keywords to search for, comma-separated for a batch (e.g., 'python', 'data science, sql'): ").strip()
     
     if not keywords:
         keywords = "python"  # Default keyword
+    keywords_list = [keyword.strip() for keyword in keywords.split(',') if keyword.strip()]
     
     # Ask if user wants to use all sources or just reliable ones
     use_all = input("Use all job sources? (y/n, default=y): ").strip().lower()
@@ -664,15 +636,28 @@ def main():
     use_selenium_input = input("Use Selenium for better scraping? (y/n, default=y): ").strip().lower()
     use_selenium = use_selenium_input != 'n'
     
+    # Ask if sources should be scraped in parallel
+    concurrent_input = input("Scrape sources concurrently? (y/n, default=y): ").strip().lower()
+    concurrent = concurrent_input != 'n'
+    
+    # Ask if only listings not seen in earlier runs should be scraped
+    incremental_input = input("Only scrape new listings (incremental)? (y/n, default=n): ").strip().lower()
+    incremental = incremental_input == 'y'
+    
     print(f"\nSearching for ~50 jobs/internships with keywords: {keywords}")
     print(f"Using all sources: {use_all_sources}")
     print(f"Using Selenium: {use_selenium}")
+    print(f"Concurrent sources: {concurrent}")
+    print(f"Incremental: {incremental}")
     
     # Create scraper instance
-    scraper = JobScraper(use_selenium=use_selenium)
+    scraper = JobScraper(use_selenium=use_selenium, incremental=incremental)
     
-    # Run the scraper
-    jobs_data = scraper.run_scraper(keywords, use_all_sources=use_all_sources)
+    # Run the scraper (several keywords share one batch)
+    if len(keywords_list) > 1:
+        jobs_data = scraper.run_batch(keywords_list, use_all_sources=use_all_sources)
+    else:
+        jobs_data = scraper.run_scraper(keywords_list[0], use_all_sources=use_all_sources, concurrent=concurrent)
     
     # Display summary
     print("\n" + "="*60)
@@ -689,7 +674,9 @@ def main():
             print(f"   Apply Link: {job['Apply Link']}")
             print(f"   Email: {job['EmailID']}")
     
-    print(f"\nData saved to CSV file!")
+    print(f"\nData saved to the job store at {JOB_STORE_PATH}")
+    if SCRAPE_SAVE_CSV:
+        print(f"Data saved to CSV file in {SCRAPE_OUTPUT_DIR}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,286 @@
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+
+TASK_DB_PATH = os.getenv('TASK_DB_PATH', os.path.join('.cache', 'tasks.db'))
+TASK_WORKERS = int(os.getenv('TASK_WORKERS', 2))
+# Start the worker processes from the Streamlit server on first submit
+TASK_EMBEDDED_WORKERS = os.getenv('TASK_EMBEDDED_WORKERS', '1') == '1'
+TASK_POLL_INTERVAL = float(os.getenv('TASK_POLL_INTERVAL', 1.0))
+# Running tasks whose worker has been silent this long are assumed dead and requeued
+TASK_STALE_SECONDS = int(os.getenv('TASK_STALE_SECONDS', 120))
+TASK_MAX_ATTEMPTS = int(os.getenv('TASK_MAX_ATTEMPTS', 2))
+
+FINISHED_STATUSES = ('done', 'failed')
+
+
+class TaskQueue:
+    """SQLite-backed queue of background tasks, safe to share between processes
+
+    Tasks outlive Streamlit reruns, closed tabs and server restarts; the
+    UI polls them by id and fetches the JSON result once done.
+    A task moves queued -> running -> done/failed. Claiming runs in an
+    IMMEDIATE transaction so two workers never take the same task, and
+    workers refresh a heartbeat while running so tasks of a crashed
+    worker go back to the queue (up to TASK_MAX_ATTEMPTS runs). A running
+    task may publish a partial result for pollers to show early.
+    """
+
+    def __init__(self, path=TASK_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT,
+                    params TEXT,
+                    status TEXT,
+                    progress TEXT,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER,
+                    worker TEXT,
+                    created_at REAL,
+                    started_at REAL,
+                    heartbeat REAL,
+                    finished_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, created_at)")
+
+    @contextmanager
+    def connect(self):
+        """Short-lived connection committed on success, so any thread or process can use the queue"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def submit(self, kind, params):
+        """Queue a task; returns its id"""
+        if kind not in TASK_HANDLERS:
+            raise ValueError(f"Unknown task kind: {kind}")
+        task_id = uuid.uuid4().hex[:12]
+        with self.connect() as conn:
+            conn.execute(
+                "INSERT INTO tasks (id, kind, params, status, progress, attempts, created_at) "
+                "VALUES (?, ?, ?, 'queued', 'Waiting for a worker', 0, ?)",
+                (task_id, kind, json.dumps(params), time.time()))
+        return task_id
+
+    def claim(self, worker):
+        """Take the oldest queued task as (id, kind, params), or None when the queue is empty"""
+        now = time.time()
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Recover tasks whose worker died
+            conn.execute("""
+                UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END,
+                                 error = CASE WHEN attempts >= ? THEN 'Worker stopped responding' ELSE error END,
+                                 finished_at = CASE WHEN attempts >= ? THEN ? ELSE finished_at END
+                WHERE status = 'running' AND heartbeat < ?
+            """, (TASK_MAX_ATTEMPTS, TASK_MAX_ATTEMPTS, TASK_MAX_ATTEMPTS, now, now - TASK_STALE_SECONDS))
+            row = conn.execute(
+                "SELECT id, kind, params FROM tasks WHERE status = 'queued' ORDER BY created_at LIMIT 1").fetchone()
+            if row is None:
+                return None
+            conn.execute("""
+                UPDATE tasks SET status = 'running', progress = 'Started', result = NULL, attempts = attempts + 1,
+                                 worker = ?, started_at = ?, heartbeat = ?
+                WHERE id = ?
+            """, (worker, now, now, row[0]))
+        return row[0], row[1], json.loads(row[2])
+
+    def heartbeat(self, task_id, progress=None, partial=None):
+        """Mark a task alive; `partial` replaces its result so far"""
+        with self.connect() as conn:
+            conn.execute("""
+                UPDATE tasks SET heartbeat = ?, progress = COALESCE(?, progress), result = COALESCE(?, result)
+                WHERE id = ?
+            """, (time.time(), progress, None if partial is None else json.dumps(partial), task_id))
+
+    def finish(self, task_id, result):
+        with self.connect() as conn:
+            conn.execute("UPDATE tasks SET status = 'done', progress = 'Finished', result = ?, finished_at = ? "
+                         "WHERE id = ?", (json.dumps(result), time.time(), task_id))
+
+    def fail(self, task_id, error):
+        with self.connect() as conn:
+            conn.execute("UPDATE tasks SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                         (str(error), time.time(), task_id))
+
+    def get(self, task_id, with_result=True):
+        """Task as a dict (result decoded, partial while running), or None for an unknown id"""
+        columns = "*" if with_result else "id, kind, status, progress, error, attempts, created_at, started_at, finished_at"
+        with self.connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(f"SELECT {columns} FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            return None
+        task = dict(row)
+        if task.get('params') is not None:
+            task['params'] = json.loads(task['params'])
+        if task.get('result') is not None:
+            task['result'] = json.loads(task['result'])
+        return task
+
+    def counts(self):
+        with self.connect() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"))
+
+
+def run_scrape(params, progress):
+    """Scrape and clean jobs for a keyword; returns the cleaned job records"""
+    from app import scrape_jobs
+    jobs_df = scrape_jobs(params['keyword'], use_cache=params.get('use_cache', True), progress=progress)
+    return [] if jobs_df is None else jobs_df.to_dict('records')
+
+
+def run_clean(params, progress):
+    """Clean raw job records, or the stored jobs seen for a keyword in the last `days` days"""
+    from app import clean_jobs_data, jobs_to_dataframe
+    from job_store import get_job_store
+    keyword = params['keyword']
+    records = params.get('records')
+    if records is None:
+        records = get_job_store().recent(keyword, days=params.get('days', 7))
+    progress(f"Cleaning {len(records)} jobs")
+    return clean_jobs_data(jobs_to_dataframe(records), keyword, raise_errors=True).to_dict('records')
+
+
+def run_score(params, progress):
+    """Pre-filter jobs against resume text locally, then LLM-score the top candidates"""
+    from app import LLM_RERANK_TOP_K, score_jobs_concurrently
+    from match_prefilter import prefilter_jobs
+    jobs, resume_text = params['jobs'], params['resume_text']
+    candidates, _ = prefilter_jobs(jobs, resume_text, params.get('top_k', LLM_RERANK_TOP_K))
+    scored_jobs = []
+    for scored, job in enumerate(score_jobs_concurrently(candidates, resume_text), start=1):
+        scored_jobs.append(job)
+        # Publish the scores so far, so the UI can show cards as they arrive
+        progress(f"Scored {scored}/{len(candidates)} top matches",
+                 partial=sorted(scored_jobs, key=lambda job: job['match_score'], reverse=True))
+    jobs.sort(key=lambda job: (job.get('match_score', 0), job.get('similarity', 0)), reverse=True)
+    return jobs
+
+
+TASK_HANDLERS = {
+    'scrape': run_scrape,
+    'clean': run_clean,
+    'score': run_score,
+}
+
+
+def run_task(queue, task_id, kind, params):
+    """Run one claimed task, heartbeating in the background so it is not requeued while alive"""
+    done = threading.Event()
+
+    def beat():
+        while not done.wait(TASK_STALE_SECONDS / 4):
+            queue.heartbeat(task_id)
+
+    threading.Thread(target=beat, name=f"heartbeat-{task_id}", daemon=True).start()
+    try:
+        result = TASK_HANDLERS[kind](params, lambda message, partial=None: queue.heartbeat(task_id, message, partial))
+        queue.finish(task_id, result)
+    except Exception as e:
+        traceback.print_exc()
+        queue.fail(task_id, e)
+    finally:
+        done.set()
+
+
+def worker_main(path=TASK_DB_PATH, poll_interval=TASK_POLL_INTERVAL):
+    """Worker process loop: claim, run, repeat"""
+    queue = TaskQueue(path)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    while True:
+        claimed = queue.claim(worker)
+        if claimed is None:
+            time.sleep(poll_interval)
+            continue
+        run_task(queue, *claimed)
+
+
+class TaskWorkers:
+    """Fixed-size set of worker processes, restarted if one dies"""
+
+    def __init__(self, size=TASK_WORKERS, path=TASK_DB_PATH):
+        self.size = size
+        self.path = path
+        self.processes = []
+        self.lock = threading.Lock()
+
+    def ensure_started(self):
+        # Spawned, not forked: the Streamlit server process is multi-threaded
+        context = multiprocessing.get_context('spawn')
+        with self.lock:
+            self.processes = [process for process in self.processes if process.is_alive()]
+            while len(self.processes) < self.size:
+                process = context.Process(target=worker_main, args=(self.path,), name="task-worker", daemon=True)
+                process.start()
+                self.processes.append(process)
+
+
+_queue = None
+_workers = None
+_shared_lock = threading.Lock()
+
+
+def get_task_queue():
+    """Process-wide TaskQueue (the SQLite file itself is shared across processes)"""
+    global _queue
+    with _shared_lock:
+        if _queue is None:
+            _queue = TaskQueue()
+        return _queue
+
+
+def get_task_workers():
+    global _workers
+    with _shared_lock:
+        if _workers is None:
+            _workers = TaskWorkers()
+        return _workers
+
+
+def submit_task(kind, params):
+    """Queue a task (starting the embedded workers if enabled); returns its id"""
+    task_id = get_task_queue().submit(kind, params)
+    if TASK_EMBEDDED_WORKERS:
+        get_task_workers().ensure_started()
+    return task_id
+
+
+def main():
+    """Run task workers on their own, e.g. with TASK_EMBEDDED_WORKERS=0 set for the Streamlit server"""
+    parser = argparse.ArgumentParser(description="Run background task workers")
+    parser.add_argument('--workers', type=int, default=TASK_WORKERS)
+    args = parser.parse_args()
+
+    workers = TaskWorkers(size=args.workers)
+    print(f"Starting {args.workers} task workers on {TASK_DB_PATH}")
+    try:
+        while True:
+            workers.ensure_started()
+            time.sleep(TASK_STALE_SECONDS / 4)
+    except KeyboardInterrupt:
+        print("Stopping task workers")
+
+
+if __name__ == "__main__":
+    main()